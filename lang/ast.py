@@ -1,36 +1,69 @@
-from lang.tokens import Token
+from lang.tokens import Token, BINARY_OPS, UNARY_OPS
+
+# Statement kinds; each node class carries one as `_op` so executors can
+# index a handler tuple instead of looking up the class.
+(
+    STMT_VAR_DECL,
+    STMT_ASSIGN,
+    STMT_IF,
+    STMT_WHILE,
+    STMT_FOR,
+    STMT_RETURN,
+    STMT_BREAK,
+    STMT_CONTINUE,
+    STMT_EXPR,
+) = range(9)
 
 class ASTNode:
-    pass
+    # Nodes are plentiful and fixed-shape; slots drop the per-instance __dict__
+    __slots__ = ()
+    _op = -1  # not an executable statement (Program, FuncDecl)
 
 class Program(ASTNode):
+    __slots__ = ("statements",)
+
     def __init__(self, statements):
         self.statements = statements
 
 class VarDecl(ASTNode):
+    __slots__ = ("var_name", "var_type", "init_value", "slot")
+    _op = STMT_VAR_DECL
+
     def __init__(self, var_name: Token, var_type: Token, init_value: Token):
         self.var_name = var_name
         self.var_type = var_type
         self.init_value = init_value
+        self.slot = None  # local slot, set by lang.resolver inside functions
 
 class FuncDecl(ASTNode):
+    __slots__ = ("func_name", "params", "body")
+
     def __init__(self, func_name: Token, params: list, body: list):
         self.func_name = func_name
         self.params = params
         self.body = body
 
 class IfStmt(ASTNode):
+    __slots__ = ("condition", "then_branch", "else_branch")
+    _op = STMT_IF
+
     def __init__(self, condition: Token, then_branch: ASTNode, else_branch: ASTNode = None):
         self.condition = condition
         self.then_branch = then_branch
         self.else_branch = else_branch
 
 class WhileStmt(ASTNode):
+    __slots__ = ("condition", "body")
+    _op = STMT_WHILE
+
     def __init__(self, condition: Token, body: ASTNode):
         self.condition = condition
         self.body = body
 
 class ForStmt(ASTNode):
+    __slots__ = ("init", "condition", "increment", "body")
+    _op = STMT_FOR
+
     def __init__(self, init: Token, condition: Token, increment: Token, body: ASTNode):
         self.init = init
         self.condition = condition
@@ -38,43 +71,73 @@ class ForStmt(ASTNode):
         self.body = body
 
 class ReturnStmt(ASTNode):
+    __slots__ = ("value",)
+    _op = STMT_RETURN
+
     def __init__(self, value: Token):
         self.value = value
 
 class BreakStmt(ASTNode):
-    pass
+    __slots__ = ()
+    _op = STMT_BREAK
 
 class ContinueStmt(ASTNode):
-    pass
+    __slots__ = ()
+    _op = STMT_CONTINUE
 
 class AssignStmt(ASTNode):
+    __slots__ = ("var_name", "value", "slot")
+    _op = STMT_ASSIGN
+
     def __init__(self, var_name: Token, value: Token):
         self.var_name = var_name
         self.value = value
+        self.slot = None
 
 class Expr(ASTNode):
-    pass
+    __slots__ = ()
+    _op = STMT_EXPR
 
 class BinaryExpr(Expr):
+    __slots__ = ("left", "operator", "right", "op_code", "numeric_kind", "depth")
+
     def __init__(self, left: Expr, operator: Token, right: Expr):
         self.left = left
         self.operator = operator
         self.right = right
+        # None for operators the language does not define
+        self.op_code = BINARY_OPS.get(operator.value)
+        self.numeric_kind = None  # "int" when lang.resolver proves both operands are ints
+        # Height of the BinaryExpr subtree rooted here (1 for `a + b`)
+        self.depth = 1 + max(
+            left.depth if type(left) is BinaryExpr else 0,
+            right.depth if type(right) is BinaryExpr else 0,
+        )
 
 class UnaryExpr(Expr):
+    __slots__ = ("operator", "operand", "op_code")
+
     def __init__(self, operator: Token, operand: Expr):
         self.operator = operator
         self.operand = operand
+        self.op_code = UNARY_OPS.get(operator.value)
 
 class Literal(Expr):
+    __slots__ = ("value",)
+
     def __init__(self, value: Token):
         self.value = value
 
 class Identifier(Expr):
+    __slots__ = ("name", "slot")
+
     def __init__(self, name: Token):
         self.name = name
+        self.slot = None
 
 class CallExpr(Expr):
+    __slots__ = ("callee", "args")
+
     def __init__(self, callee: Expr, args: list[Expr]):
         self.callee = callee
         self.args = args
@@ -0,0 +1,387 @@
+"""
+Bytecode compiler for clite.
+
+Lowers function bodies into a flat list of stack-machine instructions so the
+interpreter can run them in a single dispatch loop instead of re-walking the
+AST. Identifiers are resolved at compile time (see lang.resolver): locals
+get integer slots, anything else falls back to a global lookup by name.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any, Container, Dict, List, Tuple
+
+from lang.ast import (
+    VarDecl,
+    IfStmt,
+    WhileStmt,
+    ForStmt,
+    ReturnStmt,
+    BreakStmt,
+    ContinueStmt,
+    AssignStmt,
+    Expr,
+    BinaryExpr,
+    UnaryExpr,
+    Literal,
+    Identifier,
+    CallExpr,
+)
+from lang.tokens import Token, TokenType, NOT_CACHED
+from lang.resolver import resolve_function
+
+# Opcodes (instructions are tuples: (opcode, *operands))
+(
+    OP_LOAD_CONST,      # (op, const_idx)
+    OP_LOAD_LOCAL,      # (op, slot)
+    OP_STORE_LOCAL,     # (op, slot)
+    OP_LOAD_GLOBAL,     # (op, name_idx)
+    OP_STORE_GLOBAL,    # (op, name_idx)
+    OP_POP,
+    OP_ADD,
+    OP_SUB,
+    OP_MUL,
+    OP_DIV,
+    OP_MOD,
+    OP_LT,
+    OP_LE,
+    OP_GT,
+    OP_GE,
+    OP_EQ,
+    OP_NE,
+    OP_NEG,
+    OP_NOT,
+    OP_JUMP,            # (op, target)
+    OP_JUMP_IF_FALSE,   # (op, target) pops condition
+    OP_JUMP_IF_TRUE,    # (op, target) pops condition
+    OP_CALL,            # (op, nargs)
+    OP_RETURN,
+    # Superinstructions for the common loop shapes
+    OP_INC_LOCAL,       # (op, slot, amount)      x = x + <int literal>
+    OP_ADD_LOCAL_CONST, # (op, slot, const_idx)   push x + <literal>
+    OP_LT_LOCAL_CONST,  # (op, slot, const_idx)   push x < <literal>
+) = range(27)
+
+_BINARY_OPCODES: Dict[str, int] = {
+    "+": OP_ADD,
+    "-": OP_SUB,
+    "*": OP_MUL,
+    "/": OP_DIV,
+    "%": OP_MOD,
+    "<": OP_LT,
+    "<=": OP_LE,
+    ">": OP_GT,
+    ">=": OP_GE,
+    "==": OP_EQ,
+    "!=": OP_NE,
+}
+
+_UNARY_OPCODES: Dict[str, int] = {
+    "-": OP_NEG,
+    "!": OP_NOT,
+}
+
+
+@dataclass
+class CodeObject:
+    name: str
+    code: List[Tuple[Any, ...]] = field(default_factory=list)
+    consts: List[Any] = field(default_factory=list)
+    names: List[str] = field(default_factory=list)
+    n_params: int = 0
+    n_locals: int = 0
+
+
+class Compiler:
+    def __init__(self, name: str):
+        self.co = CodeObject(name=name)
+        # One entry per enclosing loop: (break jumps, continue jumps) awaiting a target
+        self.loops: List[Tuple[List[int], List[int]]] = []
+
+    # --- Entry point ---
+    def compile_function(
+        self,
+        params: List[Tuple[Token, Token]],
+        body: List[Any],
+        global_names: Container[str] = frozenset(),
+    ) -> CodeObject:
+        self.co.n_locals = resolve_function(params, body, global_names)
+        self.co.n_params = len(params)
+        self.compile_block(body)
+        # Falling off the end returns null
+        self.emit(OP_LOAD_CONST, self.const(None))
+        self.emit(OP_RETURN)
+        return self.co
+
+    # --- Emission helpers ---
+    def emit(self, *instr) -> int:
+        self.co.code.append(instr)
+        return len(self.co.code) - 1
+
+    def patch(self, at: int, target: int) -> None:
+        op = self.co.code[at][0]
+        self.co.code[at] = (op, target)
+
+    def here(self) -> int:
+        return len(self.co.code)
+
+    def const(self, value: Any) -> int:
+        # Compare by type too so True/1 and False/0 keep separate slots
+        for i, c in enumerate(self.co.consts):
+            if type(c) is type(value) and c == value:
+                return i
+        self.co.consts.append(value)
+        return len(self.co.consts) - 1
+
+    def name(self, name: str) -> int:
+        if name in self.co.names:
+            return self.co.names.index(name)
+        self.co.names.append(name)
+        return len(self.co.names) - 1
+
+    # --- Statements ---
+    def compile_block(self, statements: List[Any]) -> None:
+        # Scoping was settled by the resolver; a block is just its statements
+        for st in statements:
+            self.compile_stmt(st)
+
+    def compile_stmt(self, node: Any) -> None:
+        if isinstance(node, VarDecl):
+            # The resolver left slot None only when the name is already a global
+            self.compile_expr(node.init_value)
+            if node.slot is not None:
+                self.emit(OP_STORE_LOCAL, node.slot)
+            else:
+                self.emit(OP_STORE_GLOBAL, self.name(node.var_name.value))
+            return
+
+        if isinstance(node, AssignStmt):
+            if node.slot is not None:
+                amount = _increment_of(node)
+                if amount is not None:
+                    self.emit(OP_INC_LOCAL, node.slot, amount)
+                    return
+            self.compile_expr(node.value)
+            if node.slot is not None:
+                self.emit(OP_STORE_LOCAL, node.slot)
+            else:
+                self.emit(OP_STORE_GLOBAL, self.name(node.var_name.value))
+            return
+
+        if isinstance(node, IfStmt):
+            self.compile_expr(node.condition)
+            jump_else = self.emit(OP_JUMP_IF_FALSE, None)
+            self.compile_block(node.then_branch)
+            if node.else_branch is not None:
+                jump_end = self.emit(OP_JUMP, None)
+                self.patch(jump_else, self.here())
+                self.compile_block(node.else_branch)
+                self.patch(jump_end, self.here())
+            else:
+                self.patch(jump_else, self.here())
+            return
+
+        if isinstance(node, WhileStmt):
+            start = self.here()
+            self.compile_expr(node.condition)
+            jump_end = self.emit(OP_JUMP_IF_FALSE, None)
+            self.loops.append(([], []))
+            self.compile_block(node.body)
+            breaks, continues = self.loops.pop()
+            self.emit(OP_JUMP, start)
+            end = self.here()
+            self.patch(jump_end, end)
+            for at in breaks:
+                self.patch(at, end)
+            for at in continues:
+                self.patch(at, start)
+            return
+
+        if isinstance(node, ForStmt):
+            # init; while (condition) { body; increment; }
+            self.compile_stmt(node.init)
+            start = self.here()
+            self.compile_expr(node.condition)
+            jump_end = self.emit(OP_JUMP_IF_FALSE, None)
+            self.loops.append(([], []))
+            self.compile_block(node.body)
+            breaks, continues = self.loops.pop()
+            increment = self.here()
+            self.compile_stmt(node.increment)
+            self.emit(OP_JUMP, start)
+            end = self.here()
+            self.patch(jump_end, end)
+            for at in breaks:
+                self.patch(at, end)
+            for at in continues:
+                self.patch(at, increment)
+            return
+
+        if isinstance(node, ReturnStmt):
+            self.compile_expr(node.value)
+            self.emit(OP_RETURN)
+            return
+
+        if isinstance(node, BreakStmt):
+            if not self.loops:
+                raise RuntimeError("'break' outside of a loop")
+            self.loops[-1][0].append(self.emit(OP_JUMP, None))
+            return
+
+        if isinstance(node, ContinueStmt):
+            if not self.loops:
+                raise RuntimeError("'continue' outside of a loop")
+            self.loops[-1][1].append(self.emit(OP_JUMP, None))
+            return
+
+        if isinstance(node, Expr):
+            # Expression statement; evaluate and discard
+            self.compile_expr(node)
+            self.emit(OP_POP)
+            return
+
+        if isinstance(node, list):
+            self.compile_block(node)
+            return
+
+        raise RuntimeError(f"Unsupported statement node: {type(node).__name__}")
+
+    # --- Expressions ---
+    def compile_expr(self, node: Any) -> None:
+        # Certain places store raw Tokens instead of Expr nodes
+        if isinstance(node, Token):
+            self.emit(OP_LOAD_CONST, self.const(literal_value(node)))
+            return
+
+        if isinstance(node, Literal):
+            self.emit(OP_LOAD_CONST, self.const(literal_value(node.value)))
+            return
+
+        if isinstance(node, Identifier):
+            if node.slot is not None:
+                self.emit(OP_LOAD_LOCAL, node.slot)
+            else:
+                self.emit(OP_LOAD_GLOBAL, self.name(node.name.value))
+            return
+
+        if isinstance(node, UnaryExpr):
+            op = node.operator.value
+            if op not in _UNARY_OPCODES:
+                raise RuntimeError(f"Unsupported unary operator: {op}")
+            self.compile_expr(node.operand)
+            self.emit(_UNARY_OPCODES[op])
+            return
+
+        if isinstance(node, BinaryExpr):
+            op = node.operator.value
+            # Short-circuit for logical ops; result is always a bool
+            if op in ("&&", "||"):
+                jump = OP_JUMP_IF_FALSE if op == "&&" else OP_JUMP_IF_TRUE
+                self.compile_expr(node.left)
+                first = self.emit(jump, None)
+                self.compile_expr(node.right)
+                second = self.emit(jump, None)
+                self.emit(OP_LOAD_CONST, self.const(op == "&&"))
+                jump_end = self.emit(OP_JUMP, None)
+                short = self.here()
+                self.emit(OP_LOAD_CONST, self.const(op == "||"))
+                self.patch(first, short)
+                self.patch(second, short)
+                self.patch(jump_end, self.here())
+                return
+            if op not in _BINARY_OPCODES:
+                raise RuntimeError(f"Unsupported binary operator: {op}")
+            if op in ("+", "<"):
+                left, right = node.left, node.right
+                lit = _literal_token(right)
+                if isinstance(left, Identifier) and left.slot is not None and lit is not None:
+                    fused = OP_ADD_LOCAL_CONST if op == "+" else OP_LT_LOCAL_CONST
+                    self.emit(fused, left.slot, self.const(literal_value(lit)))
+                    return
+            self.compile_expr(node.left)
+            self.compile_expr(node.right)
+            self.emit(_BINARY_OPCODES[op])
+            return
+
+        if isinstance(node, CallExpr):
+            self.compile_expr(node.callee)
+            for a in node.args:
+                self.compile_expr(a)
+            self.emit(OP_CALL, len(node.args))
+            return
+
+        raise RuntimeError(f"Unsupported expression node: {type(node).__name__}")
+
+
+def _literal_token(node: Any) -> Any:
+    # Literals show up both wrapped in Literal and as bare Tokens
+    if isinstance(node, Literal):
+        return node.value
+    if isinstance(node, Token):
+        return node
+    return None
+
+
+def _increment_of(node: AssignStmt) -> Any:
+    # The int amount if node is `x = x + <int literal>` for a local x, else None
+    value = node.value
+    if not isinstance(value, BinaryExpr) or value.operator.value != "+":
+        return None
+    left = value.left
+    if not isinstance(left, Identifier) or left.slot != node.slot:
+        return None
+    lit = _literal_token(value.right)
+    if lit is None or lit.type != TokenType.INT:
+        return None
+    return literal_value(lit)
+
+
+def literal_value(tok: Token) -> Any:
+    # Literals inside loops are evaluated over and over; parse each token once
+    value = tok.cached
+    if value is NOT_CACHED:
+        value = _parse_literal(tok)
+        # Token is frozen; the cache slot is excluded from equality and hashing
+        object.__setattr__(tok, "cached", value)
+    return value
+
+
+def _parse_literal(tok: Token) -> Any:
+    if tok.type == TokenType.INT:
+        return int(tok.value)
+    if tok.type == TokenType.FLOAT:
+        return float(tok.value)
+    if tok.type == TokenType.STRING:
+        return _unquote(tok.value)
+    if tok.type == TokenType.KEYWORD:
+        if tok.value == 'true':
+            return True
+        if tok.value == 'false':
+            return False
+        if tok.value == 'null':
+            return None
+    # For identifiers used as literals (shouldn't happen), return raw value
+    return tok.value
+
+
+def _unquote(s: str) -> str:
+    # Remove surrounding quotes and unescape common sequences
+    if len(s) >= 2 and s[0] == '"' and s[-1] == '"':
+        s = s[1:-1]
+    # Most strings have no escapes; skip the encode/decode round-trip for them
+    if "\\" not in s:
+        return s
+    return s.encode("utf-8").decode("unicode_escape")
+
+
+def compile_function(
+    name: str,
+    params: List[Tuple[Token, Token]],
+    body: List[Any],
+    global_names: Container[str] = frozenset(),
+) -> CodeObject:
+    return Compiler(name).compile_function(params, body, global_names)
+
+
+__all__ = ["CodeObject", "Compiler", "compile_function", "literal_value"]
@@ -1,7 +1,8 @@
 from __future__ import annotations
 
+import operator
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
 
 from lang.lexer import tokenize
 from lang.parser import Parser
@@ -23,81 +24,211 @@ from lang.ast import (
     UnaryExpr,
     CallExpr,
 )
-from lang.tokens import Token, TokenType
+from lang.tokens import (
+    Token,
+    TokenType,
+    NOT_CACHED,
+    BINOP_ADD,
+    BINOP_SUB,
+    BINOP_LT,
+    BINOP_AND,
+    BINOP_OR,
+)
+from lang.resolver import resolve_function, let_names, INT_KIND
+from lang.compiler import (
+    CodeObject,
+    compile_function,
+    literal_value,
+    OP_LOAD_CONST,
+    OP_LOAD_LOCAL,
+    OP_STORE_LOCAL,
+    OP_LOAD_GLOBAL,
+    OP_STORE_GLOBAL,
+    OP_POP,
+    OP_ADD,
+    OP_SUB,
+    OP_MUL,
+    OP_DIV,
+    OP_MOD,
+    OP_LT,
+    OP_LE,
+    OP_GT,
+    OP_GE,
+    OP_EQ,
+    OP_NE,
+    OP_NEG,
+    OP_NOT,
+    OP_JUMP,
+    OP_JUMP_IF_FALSE,
+    OP_JUMP_IF_TRUE,
+    OP_CALL,
+    OP_RETURN,
+    OP_INC_LOCAL,
+    OP_ADD_LOCAL_CONST,
+    OP_LT_LOCAL_CONST,
+)
+
+
+# Indexed by BINOP_* code (see lang.tokens); && and || are handled separately
+_BINOPS = (
+    operator.add,
+    operator.sub,
+    operator.mul,
+    operator.truediv,
+    operator.mod,
+    operator.lt,
+    operator.le,
+    operator.gt,
+    operator.ge,
+    operator.eq,
+    operator.ne,
+)
+
+# BinaryExpr trees deeper than this are evaluated with an explicit stack
+# instead of one Python call per level
+_ITERATIVE_DEPTH = 4
+_STACK_OPS = frozenset(range(len(_BINOPS)))
 
+# Indexed by UNOP_* code; truthiness is plain Python truthiness, so `!` is not_
+_UNOPS = (
+    operator.neg,
+    operator.not_,
+)
 
-class ReturnSignal(Exception):
-    def __init__(self, value: Any):
-        self.value = value
 
+# Parsed programs kept per interpreter by run_code
+_PROGRAM_CACHE_SIZE = 32
 
-class BreakSignal(Exception):
-    pass
 
+# Statement results for the AST walker. Normal completion returns None; these
+# travel back up through exec_block until a loop or call consumes them.
+SIG_BREAK = 1
+SIG_CONTINUE = 2
+SIG_RETURN = 3  # the value is left in Interpreter.return_value
 
-class ContinueSignal(Exception):
-    pass
+_SIG_NAMES = {SIG_BREAK: "break", SIG_CONTINUE: "continue", SIG_RETURN: "return"}
 
 
-@dataclass
+@dataclass(slots=True)
 class Function:
     name: str
     params: List[Tuple[Token, Token]]  # (name, type)
     body: List[Any]  # list of statements (AST nodes)
     closure: "Env"  # captured environment at declaration
+    code: Optional[CodeObject] = None  # compiled lazily on first call
+    n_locals: Optional[int] = None  # slot count for the AST walker, resolved on first call
+    let_names: Optional[FrozenSet[str]] = None  # names declared by a `let` in the body
+    global_lets: FrozenSet[str] = frozenset()  # ...of those, the globals the body was resolved against
+    globals_seen: int = -1  # size of the globals dict when global_lets was computed
 
     def call(self, interp: "Interpreter", args: List[Any]) -> Any:
         if len(args) != len(self.params):
             raise RuntimeError(f"Function {self.name} expected {len(self.params)} args, got {len(args)}")
-        local = Env(parent=self.closure)
-        for (p_name, _p_type), arg in zip(self.params, args):
-            local.set(p_name.value, arg)
-        try:
-            interp.exec_block(self.body, local)
-        except ReturnSignal as rs:
-            return rs.value
+        values = self.closure.values
+        if len(values) != self.globals_seen:
+            self._check_global_lets(values)
+        if interp.bytecode:
+            if self.code is None:
+                self.code = compile_function(self.name, self.params, self.body, values)
+            return interp.exec_code(self.code, args)
+        if self.n_locals is None:
+            self.n_locals = resolve_function(self.params, self.body, values)
+        frame = Frame(self.n_locals, self.closure)
+        frame.slots[:len(args)] = args
+        sig = interp.exec_block(self.body, frame)
+        if sig == SIG_RETURN:
+            return interp.return_value
+        if sig is not None:
+            raise RuntimeError(f"'{_SIG_NAMES[sig]}' outside of a loop")
         return None
 
+    def _check_global_lets(self, values: Dict[str, Any]) -> None:
+        # A `let` of a name that is global when it runs assigns the global, as
+        # Env.set does. Globals are only added by top-level code, never while
+        # a call is running, and never removed, so the answer can only change
+        # when the dict grows; then re-resolve if one of our names appeared.
+        self.globals_seen = len(values)
+        if self.let_names is None:
+            self.let_names = let_names(self.body)
+        global_lets = frozenset(name for name in self.let_names if name in values)
+        if global_lets != self.global_lets:
+            self.global_lets = global_lets
+            self.code = None
+            self.n_locals = None
+
 
 class Env:
+    __slots__ = ("parent", "values")
+
     def __init__(self, parent: Optional["Env"] = None):
         self.parent = parent
         self.values: Dict[str, Any] = {}
 
     def get(self, name: str) -> Any:
-        if name in self.values:
-            return self.values[name]
-        if self.parent is not None:
-            return self.parent.get(name)
+        # Walk the chain in a loop rather than recursing once per scope level
+        env = self
+        while env is not None:
+            values = env.values
+            if name in values:
+                return values[name]
+            env = env.parent
         raise NameError(f"Undefined variable '{name}'")
 
     def set(self, name: str, value: Any) -> None:
         # Assign in nearest scope that already has the variable, else define in current.
-        if name in self.values:
-            self.values[name] = value
-            return
-        if self.parent is not None:
-            try:
-                self.parent.assign(name, value)
-                return
-            except NameError:
-                pass
-        # Define if not existing anywhere
-        self.values[name] = value
+        owner = self._find(name)
+        if owner is None:
+            owner = self
+        owner.values[name] = value
 
     def assign(self, name: str, value: Any) -> None:
-        if name in self.values:
-            self.values[name] = value
-        elif self.parent is not None:
-            self.parent.assign(name, value)
-        else:
+        owner = self._find(name)
+        if owner is None:
             raise NameError(f"Undefined variable '{name}'")
+        owner.values[name] = value
+
+    def _find(self, name: str) -> Optional["Env"]:
+        env = self
+        while env is not None:
+            if name in env.values:
+                return env
+            env = env.parent
+        return None
+
+
+class Frame:
+    """Locals of one function call, stored by resolver slot; other names go to globals."""
+
+    __slots__ = ("slots", "globals", "global_values")
+
+    def __init__(self, n_locals: int, globals_env: Env):
+        self.slots: List[Any] = [None] * n_locals
+        self.globals = globals_env
+        # Functions close over the root scope, so a non-local read is normally
+        # one probe of this dict; anything else falls back to the chain walk
+        self.global_values = globals_env.values
+
+    def get(self, name: str) -> Any:
+        values = self.global_values
+        if name in values:
+            return values[name]
+        return self.globals.get(name)
+
+    def set(self, name: str, value: Any) -> None:
+        self.globals.set(name, value)
+
+    def assign(self, name: str, value: Any) -> None:
+        self.globals.assign(name, value)
 
 
 class Interpreter:
-    def __init__(self):
+    def __init__(self, bytecode: bool = True):
+        # bytecode=False runs function bodies on the AST walker instead of the VM
+        self.bytecode = bytecode
         self.globals = Env()
         self.functions: Dict[str, Function] = {}
+        self.return_value: Any = None
+        self._program_cache: Dict[str, Program] = {}
 
         # Builtins (minimal)
         def _print(*vals):
@@ -105,10 +236,40 @@ class Interpreter:
 
         self.globals.set("print", _print)
 
+        # Statement handlers indexed by the node class's _op (see lang.ast);
+        # expressions dispatch on the exact node type, which is cheaper than
+        # an isinstance chain.
+        self._stmt_table = (
+            self._exec_var_decl,
+            self._exec_assign,
+            self._exec_if,
+            self._exec_while,
+            self._exec_for,
+            self._exec_return,
+            self._exec_break,
+            self._exec_continue,
+            self._exec_expr_stmt,
+        )
+        self._expr_handlers = {
+            Literal: self._eval_literal,
+            Identifier: self._eval_identifier,
+            BinaryExpr: self._eval_binary,
+            UnaryExpr: self._eval_unary,
+            CallExpr: self._eval_call,
+            Token: self._eval_token,
+        }
+
     # --- Public API ---
     def run_code(self, code: str, entrypoint: Optional[str] = None) -> Any:
-        tokens = tokenize(code)
-        program = Parser(tokens).parse()
+        # Re-running the same source skips lexing and parsing. Keyed on the
+        # text itself, so a hash collision can never return the wrong program.
+        program = self._program_cache.get(code)
+        if program is None:
+            program = Parser(tokenize(code)).parse()
+            if len(self._program_cache) >= _PROGRAM_CACHE_SIZE:
+                # Dicts keep insertion order: drop the oldest entry
+                del self._program_cache[next(iter(self._program_cache))]
+            self._program_cache[code] = program
         return self.run(program, entrypoint=entrypoint)
 
     def run(self, program: Program, entrypoint: Optional[str] = None) -> Any:
@@ -127,7 +288,10 @@ class Interpreter:
         # Execute top-level statements (non-function declarations)
         for stmt in program.statements:
             if not isinstance(stmt, FuncDecl):
-                self.exec_stmt(stmt, self.globals)
+                sig = self.exec_stmt(stmt, self.globals)
+                if sig is not None:
+                    kind = "a function" if sig == SIG_RETURN else "a loop"
+                    raise RuntimeError(f"'{_SIG_NAMES[sig]}' outside of {kind}")
 
         # If requested, invoke an entrypoint function
         if entrypoint is not None and entrypoint in self.functions:
@@ -135,190 +299,300 @@ class Interpreter:
         return None
 
     # --- Execution helpers ---
-    def exec_block(self, statements: List[Any], env: Env) -> None:
-        # Blocks introduce a new scope
-        block_env = Env(parent=env)
+    def exec_block(self, statements: List[Any], env: Env) -> Optional[int]:
+        # Blocks introduce a new scope; inside a function the resolver already
+        # gave each block's locals their own slots, so the frame is reused.
+        block_env = env if type(env) is Frame else Env(parent=env)
+        exec_stmt = self.exec_stmt
         for st in statements:
-            self.exec_stmt(st, block_env)
-
-    def exec_stmt(self, node: Any, env: Env) -> Any:
-        if isinstance(node, VarDecl):
-            name = node.var_name.value
-            value = self.eval_expr(node.init_value, env)
-            env.set(name, value)
-            return None
-
-        if isinstance(node, AssignStmt):
-            name = node.var_name.value
-            value = self.eval_expr(node.value, env)
-            env.assign(name, value)
-            return None
-
-        if isinstance(node, IfStmt):
-            cond = self.truthy(self.eval_expr(node.condition, env))
-            if cond:
-                # then_branch may be a list (block) or a single statement
-                if isinstance(node.then_branch, list):
-                    self.exec_block(node.then_branch, env)
-                else:
-                    self.exec_stmt(node.then_branch, env)
-            else:
-                if node.else_branch is not None:
-                    if isinstance(node.else_branch, list):
-                        self.exec_block(node.else_branch, env)
-                    else:
-                        self.exec_stmt(node.else_branch, env)
-            return None
-
-        if isinstance(node, WhileStmt):
-            while self.truthy(self.eval_expr(node.condition, env)):
-                try:
-                    if isinstance(node.body, list):
-                        self.exec_block(node.body, env)
-                    else:
-                        self.exec_stmt(node.body, env)
-                except ContinueSignal:
-                    continue
-                except BreakSignal:
-                    break
-            return None
-
-        if isinstance(node, ForStmt):
-            # Basic for: init; while (condition) { body; increment; }
-            self.exec_stmt(node.init, env)
-            while self.truthy(self.eval_expr(node.condition, env)):
-                try:
-                    if isinstance(node.body, list):
-                        self.exec_block(node.body, env)
-                    else:
-                        self.exec_stmt(node.body, env)
-                except ContinueSignal:
-                    pass
-                except BreakSignal:
+            sig = exec_stmt(st, block_env)
+            if sig is not None:
+                return sig
+        return None
+
+    def exec_stmt(self, node: Any, env: Env) -> Optional[int]:
+        # Raw lists (nested blocks) carry no _op
+        op = getattr(node, "_op", -1)
+        if op >= 0:
+            return self._stmt_table[op](node, env)
+        if type(node) is list:
+            return self._exec_list(node, env)
+        raise RuntimeError(f"Unsupported statement node: {type(node).__name__}")
+
+    def _exec_var_decl(self, node: VarDecl, env: Env) -> None:
+        value = self.eval_expr(node.init_value, env)
+        if node.slot is not None:
+            env.slots[node.slot] = value
+        else:
+            env.set(node.var_name.value, value)
+
+    def _exec_assign(self, node: AssignStmt, env: Env) -> None:
+        value = self.eval_expr(node.value, env)
+        if node.slot is not None:
+            env.slots[node.slot] = value
+        else:
+            env.assign(node.var_name.value, value)
+
+    def _exec_if(self, node: IfStmt, env: Env) -> Optional[int]:
+        if self.truthy(self.eval_expr(node.condition, env)):
+            return self.exec_block(node.then_branch, env)
+        if node.else_branch is not None:
+            return self.exec_block(node.else_branch, env)
+        return None
+
+    def _exec_while(self, node: WhileStmt, env: Env) -> Optional[int]:
+        # Bind everything the loop touches once, not per iteration
+        eval_expr = self.eval_expr
+        truthy = self.truthy
+        exec_block = self.exec_block
+        cond = node.condition
+        body = node.body
+        while truthy(eval_expr(cond, env)):
+            sig = exec_block(body, env)
+            if sig is not None:
+                if sig == SIG_BREAK:
                     break
-                finally:
-                    self.exec_stmt(node.increment, env)
-            return None
+                if sig == SIG_RETURN:
+                    return sig
+                # SIG_CONTINUE: go straight to the next condition check
+        return None
 
-        if isinstance(node, ReturnStmt):
-            val = self.eval_expr(node.value, env)
-            raise ReturnSignal(val)
+    def _exec_for(self, node: ForStmt, env: Env) -> Optional[int]:
+        # Basic for: init; while (condition) { body; increment; }
+        eval_expr = self.eval_expr
+        truthy = self.truthy
+        exec_block = self.exec_block
+        exec_stmt = self.exec_stmt
+        cond = node.condition
+        body = node.body
+        increment = node.increment
+        exec_stmt(node.init, env)
+        while truthy(eval_expr(cond, env)):
+            sig = exec_block(body, env)
+            if sig is not None:
+                if sig == SIG_BREAK:
+                    break
+                if sig == SIG_RETURN:
+                    return sig
+            exec_stmt(increment, env)
+        return None
 
-        if isinstance(node, BreakStmt):
-            raise BreakSignal()
+    def _exec_return(self, node: ReturnStmt, env: Env) -> int:
+        self.return_value = self.eval_expr(node.value, env)
+        return SIG_RETURN
 
-        if isinstance(node, ContinueStmt):
-            raise ContinueSignal()
+    def _exec_break(self, node: BreakStmt, env: Env) -> int:
+        return SIG_BREAK
 
-        if isinstance(node, Expr):
-            # Expression statement; evaluate and discard
-            _ = self.eval_expr(node, env)
-            return None
+    def _exec_continue(self, node: ContinueStmt, env: Env) -> int:
+        return SIG_CONTINUE
 
-        if isinstance(node, list):
-            # Treat raw block list as a block
-            self.exec_block(node, env)
-            return None
+    def _exec_expr_stmt(self, node: Expr, env: Env) -> None:
+        # Expression statement; evaluate and discard
+        _ = self.eval_expr(node, env)
 
-        raise RuntimeError(f"Unsupported statement node: {type(node).__name__}")
+    def _exec_list(self, node: list, env: Env) -> Optional[int]:
+        # Treat raw block list as a block
+        return self.exec_block(node, env)
 
     def eval_expr(self, node: Any, env: Env) -> Any:
-        # Certain places store raw Tokens instead of Expr nodes
-        if isinstance(node, Token):
-            return self.literal_from_token(node)
-
-        if isinstance(node, Literal):
-            return self.literal_from_token(node.value)
-
-        if isinstance(node, Identifier):
-            return env.get(node.name.value)
-
-        if isinstance(node, UnaryExpr):
-            op = node.operator.value
-            val = self.eval_expr(node.operand, env)
-            if op == '!':
-                return not self.truthy(val)
-            if op == '-':
-                return -val
-            raise RuntimeError(f"Unsupported unary operator: {op}")
-
-        if isinstance(node, BinaryExpr):
-            op = node.operator.value
-            # Short-circuit for logical ops
-            if op == '&&':
-                left = self.eval_expr(node.left, env)
-                if not self.truthy(left):
-                    return False
-                right = self.eval_expr(node.right, env)
-                return self.truthy(right)
-            if op == '||':
-                left = self.eval_expr(node.left, env)
-                if self.truthy(left):
-                    return True
-                right = self.eval_expr(node.right, env)
-                return self.truthy(right)
+        handler = self._expr_handlers.get(type(node))
+        if handler is not None:
+            return handler(node, env)
+        # Future: more expression kinds
+        raise RuntimeError(f"Unsupported expression node: {type(node).__name__}")
 
+    def _eval_token(self, node: Token, env: Env) -> Any:
+        # Certain places store raw Tokens instead of Expr nodes
+        value = node.cached
+        if value is NOT_CACHED:
+            value = self.literal_from_token(node)
+        return value
+
+    def _eval_literal(self, node: Literal, env: Env) -> Any:
+        value = node.value.cached
+        if value is NOT_CACHED:
+            value = self.literal_from_token(node.value)
+        return value
+
+    def _eval_identifier(self, node: Identifier, env: Env) -> Any:
+        if node.slot is not None:
+            return env.slots[node.slot]
+        return env.get(node.name.value)
+
+    def _eval_unary(self, node: UnaryExpr, env: Env) -> Any:
+        op_code = node.op_code
+        if op_code is None:
+            raise RuntimeError(f"Unsupported unary operator: {node.operator.value}")
+        return _UNOPS[op_code](self.eval_expr(node.operand, env))
+
+    def _eval_binary(self, node: BinaryExpr, env: Env) -> Any:
+        op_code = node.op_code
+        if node.depth > _ITERATIVE_DEPTH and op_code in _STACK_OPS:
+            return self._eval_binary_iterative(node, env)
+        if node.numeric_kind is INT_KIND:
+            # Both sides are ints: skip the logical-op checks and keep the
+            # hottest ops inline so CPython specializes them for int
             left = self.eval_expr(node.left, env)
             right = self.eval_expr(node.right, env)
-            if op == '+':
+            if op_code == BINOP_ADD:
                 return left + right
-            if op == '-':
+            if op_code == BINOP_SUB:
                 return left - right
-            if op == '*':
-                return left * right
-            if op == '/':
-                return left / right
-            if op == '%':
-                return left % right
-            if op == '<':
+            if op_code == BINOP_LT:
                 return left < right
-            if op == '<=':
-                return left <= right
-            if op == '>':
-                return left > right
-            if op == '>=':
-                return left >= right
-            if op == '==':
-                return left == right
-            if op == '!=':
-                return left != right
-            raise RuntimeError(f"Unsupported binary operator: {op}")
-
-        if isinstance(node, CallExpr):
-            callee_val = self.eval_expr(node.callee, env)
-            args = [self.eval_expr(a, env) for a in node.args]
-            if isinstance(callee_val, Function):
-                return callee_val.call(self, args)
-            if callable(callee_val):
-                return callee_val(*args)
-            raise RuntimeError("Attempted to call a non-callable value")
-
-        # Future: more expression kinds
-        raise RuntimeError(f"Unsupported expression node: {type(node).__name__}")
+            return _BINOPS[op_code](left, right)
+        # Short-circuit for logical ops
+        if op_code == BINOP_AND:
+            left = self.eval_expr(node.left, env)
+            if not self.truthy(left):
+                return False
+            right = self.eval_expr(node.right, env)
+            return self.truthy(right)
+        if op_code == BINOP_OR:
+            left = self.eval_expr(node.left, env)
+            if self.truthy(left):
+                return True
+            right = self.eval_expr(node.right, env)
+            return self.truthy(right)
+
+        left = self.eval_expr(node.left, env)
+        right = self.eval_expr(node.right, env)
+        if op_code is None:
+            raise RuntimeError(f"Unsupported binary operator: {node.operator.value}")
+        return _BINOPS[op_code](left, right)
+
+    def _eval_binary_iterative(self, root: BinaryExpr, env: Env) -> Any:
+        # Post-order walk: the todo stack holds nodes still to expand and op
+        # codes (plain ints) waiting for their two operands. Logical ops and
+        # other leaves go back through eval_expr so && and || still short-circuit.
+        eval_expr = self.eval_expr
+        operands: List[Any] = []
+        push = operands.append
+        pop = operands.pop
+        todo: List[Any] = [root]
+        while todo:
+            item = todo.pop()
+            if type(item) is int:
+                right = pop()
+                operands[-1] = _BINOPS[item](operands[-1], right)
+            elif type(item) is BinaryExpr and item.op_code in _STACK_OPS:
+                todo.append(item.op_code)
+                todo.append(item.right)
+                todo.append(item.left)
+            else:
+                push(eval_expr(item, env))
+        return operands[0]
+
+    def _eval_call(self, node: CallExpr, env: Env) -> Any:
+        callee_val = self.eval_expr(node.callee, env)
+        args = [self.eval_expr(a, env) for a in node.args]
+        return self.call_value(callee_val, args)
+
+    def call_value(self, callee_val: Any, args: List[Any]) -> Any:
+        if isinstance(callee_val, Function):
+            return callee_val.call(self, args)
+        if callable(callee_val):
+            return callee_val(*args)
+        raise RuntimeError("Attempted to call a non-callable value")
+
+    # --- Bytecode VM ---
+    def exec_code(self, co: CodeObject, args: List[Any]) -> Any:
+        code = co.code
+        consts = co.consts
+        names = co.names
+        globals_env = self.globals
+        frame: List[Any] = list(args) + [None] * (co.n_locals - len(args))
+        stack: List[Any] = []
+        push = stack.append
+        pop = stack.pop
+        ip = 0
+        while True:
+            instr = code[ip]
+            ip += 1
+            op = instr[0]
+            if op == OP_LOAD_LOCAL:
+                push(frame[instr[1]])
+            elif op == OP_LOAD_CONST:
+                push(consts[instr[1]])
+            elif op == OP_STORE_LOCAL:
+                frame[instr[1]] = pop()
+            elif op == OP_JUMP_IF_FALSE:
+                if not pop():
+                    ip = instr[1]
+            elif op == OP_JUMP:
+                ip = instr[1]
+            elif op == OP_INC_LOCAL:
+                slot = instr[1]
+                frame[slot] = frame[slot] + instr[2]
+            elif op == OP_LT_LOCAL_CONST:
+                push(frame[instr[1]] < consts[instr[2]])
+            elif op == OP_ADD_LOCAL_CONST:
+                push(frame[instr[1]] + consts[instr[2]])
+            elif op == OP_ADD:
+                b = pop()
+                stack[-1] = stack[-1] + b
+            elif op == OP_SUB:
+                b = pop()
+                stack[-1] = stack[-1] - b
+            elif op == OP_LT:
+                b = pop()
+                stack[-1] = stack[-1] < b
+            elif op == OP_MUL:
+                b = pop()
+                stack[-1] = stack[-1] * b
+            elif op == OP_DIV:
+                b = pop()
+                stack[-1] = stack[-1] / b
+            elif op == OP_MOD:
+                b = pop()
+                stack[-1] = stack[-1] % b
+            elif op == OP_LE:
+                b = pop()
+                stack[-1] = stack[-1] <= b
+            elif op == OP_GT:
+                b = pop()
+                stack[-1] = stack[-1] > b
+            elif op == OP_GE:
+                b = pop()
+                stack[-1] = stack[-1] >= b
+            elif op == OP_EQ:
+                b = pop()
+                stack[-1] = stack[-1] == b
+            elif op == OP_NE:
+                b = pop()
+                stack[-1] = stack[-1] != b
+            elif op == OP_JUMP_IF_TRUE:
+                if pop():
+                    ip = instr[1]
+            elif op == OP_NEG:
+                stack[-1] = -stack[-1]
+            elif op == OP_NOT:
+                stack[-1] = not stack[-1]
+            elif op == OP_CALL:
+                n = instr[1]
+                if n:
+                    call_args = stack[-n:]
+                    del stack[-n:]
+                else:
+                    call_args = []
+                callee_val = pop()
+                push(self.call_value(callee_val, call_args))
+            elif op == OP_LOAD_GLOBAL:
+                push(globals_env.get(names[instr[1]]))
+            elif op == OP_STORE_GLOBAL:
+                globals_env.assign(names[instr[1]], pop())
+            elif op == OP_POP:
+                pop()
+            elif op == OP_RETURN:
+                return pop()
+            else:
+                raise RuntimeError(f"Unknown opcode: {op}")
 
     # --- Utils ---
     def literal_from_token(self, tok: Token) -> Any:
-        if tok.type == TokenType.INT:
-            return int(tok.value)
-        if tok.type == TokenType.FLOAT:
-            return float(tok.value)
-        if tok.type == TokenType.STRING:
-            return self._unquote(tok.value)
-        if tok.type == TokenType.KEYWORD:
-            if tok.value == 'true':
-                return True
-            if tok.value == 'false':
-                return False
-            if tok.value == 'null':
-                return None
-        # For identifiers used as literals (shouldn't happen), return raw value
-        return tok.value
-
-    def _unquote(self, s: str) -> str:
-        # Remove surrounding quotes and unescape common sequences
-        if len(s) >= 2 and s[0] == '"' and s[-1] == '"':
-            s = s[1:-1]
-        return bytes(s, "utf-8").decode("unicode_escape")
+        # Shared with the compiler so both backends agree on literal values
+        return literal_value(tok)
 
     def truthy(self, v: Any) -> bool:
         return bool(v)
@@ -328,4 +602,4 @@ def run(code: str, entrypoint: Optional[str] = None) -> Any:
     return Interpreter().run_code(code, entrypoint=entrypoint)
 
 
-__all__ = ["Interpreter", "run", "Env", "Function"]
+__all__ = ["Interpreter", "run", "Env", "Frame", "Function"]
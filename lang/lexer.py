@@ -1,106 +1,242 @@
 import re
+import sys
 from typing import List
-from lang.tokens import Token, TokenType, OPERATORS, KEYWORDS
+from lang.tokens import Token, TokenType, OPERATORS, KEYWORDS, KEYWORD_TOKENS, NOT_CACHED
 
 # Build a regex for operators and punctuation, preferring longest match first
 _OP_LITERALS = sorted(OPERATORS, key=len, reverse=True)
 _OP_REGEX = "|".join(re.escape(op) for op in _OP_LITERALS)
 
-# Master regex with named groups; order matters for priority
+_OP_TYPE = {
+    "=": TokenType.ASSIGN,
+    ";": TokenType.END,
+    "(": TokenType.LPAREN,
+    ")": TokenType.RPAREN,
+    "{": TokenType.LBRACE,
+    "}": TokenType.RBRACE,
+    "[": TokenType.LBRACKET,
+    "]": TokenType.RBRACKET,
+    ",": TokenType.COMMA,
+    ".": TokenType.DOT,
+    ":": TokenType.COLON,
+}
+
+# Master regex with named groups. Alternatives are tried left to right, so the
+# most frequent kinds come first; the only ordering constraints are FLOAT
+# before INT and the comments before OP, which also starts with '/'.
+# Block comments only match their opening marker; the body is skipped with
+# str.find in tokenize, which keeps the alternation free of `.*?` backtracking.
+# No capture groups, and each run stops at a character its alternative cannot
+# use, so plain quantifiers have nothing useful to backtrack into.
 _MASTER_REGEX = re.compile(
     "|".join(
         [
-            r"(?P<NEWLINE>\n)",
+            r"(?P<IDENT>[A-Za-z_]\w*)",
             r"(?P<SKIP>[ \t\r]+)",
-            r"(?P<LINE_COMMENT>//[^\n]*)",
-            r"(?P<BLOCK_COMMENT>/\*.*?\*/)",
-            r"(?P<STRING>\"([^\\\n\"]|\\.)*\")",
+            r"(?P<NEWLINE>\n)",
             r"(?P<FLOAT>\d+\.\d+)",
             r"(?P<INT>\d+)",
-            r"(?P<IDENT>[A-Za-z_]\w*)",
+            r"(?P<STRING>\"(?:[^\\\n\"]|\\(?s:.))*\")",
+            r"(?P<LINE_COMMENT>//[^\n]*)",
+            r"(?P<BLOCK_COMMENT>/\*)",
             rf"(?P<OP>{_OP_REGEX})",
         ]
-    ),
-    flags=re.DOTALL,
+    )
 )
 
 
-def tokenize(code: str) -> List[Token]:
+def tokenize_regex(code: str) -> List[Token]:
+    """Reference lexer built on the master regex; kept to cross-check tokenize."""
     tokens: List[Token] = []
     pos = 0
     line = 1
     line_start = 0
     code_len = len(code)
 
+    # finditer advances through the source in C; we only leave it to restart
+    # after a block comment, whose body is skipped with str.find.
     while pos < code_len:
-        m = _MASTER_REGEX.match(code, pos)
-        if not m:
-            # Unknown character
-            ch = code[pos]
-            if ch in ("\n", " ", "\t", "\r"):
-                pos += 1
+        for m in _MASTER_REGEX.finditer(code, pos):
+            start = m.start()
+            if start != pos:
+                # finditer skipped something no group matches
+                raise SyntaxError(f"Unexpected character: {code[pos]}")
+            pos = m.end()
+            kind = m.lastgroup
+
+            if kind == "SKIP" or kind == "LINE_COMMENT":
                 continue
-            raise SyntaxError(f"Unexpected character: {ch}")
+            if kind == "NEWLINE":
+                line += 1
+                line_start = pos
+                continue
+            if kind == "BLOCK_COMMENT":
+                end = code.find("*/", pos)
+                if end >= 0:
+                    end += 2
+                    newlines = code.count("\n", start, end)
+                    if newlines:
+                        line += newlines
+                        line_start = code.rfind("\n", start, end) + 1
+                    pos = end
+                    break
+                # Unterminated comment: lex '/' as an operator like any other
+                tokens.append(Token(TokenType.OP, "/", line, start - line_start + 1))
+                pos = start + 1
+                break
 
-        kind = m.lastgroup
-        lexeme = m.group()
+            lexeme = m.group()
+            column = start - line_start + 1
 
-        if kind == "NEWLINE":
-            line += 1
-            line_start = m.end()
-            pos = m.end()
+            if kind == "INT":
+                tokens.append(Token(TokenType.INT, lexeme, line, column))
+            elif kind == "FLOAT":
+                tokens.append(Token(TokenType.FLOAT, lexeme, line, column))
+            elif kind == "STRING":
+                tokens.append(Token(TokenType.STRING, lexeme, line, column))
+            elif kind == "IDENT":
+                # Interned names make the Env/dict lookups keyed on them
+                # hit CPython's identity fast path
+                lexeme = sys.intern(lexeme)
+                if lexeme in KEYWORDS:
+                    tokens.append(Token(TokenType.KEYWORD, lexeme, line, column))
+                else:
+                    tokens.append(Token(TokenType.IDENT, lexeme, line, column))
+            elif kind == "OP":
+                # Punctuation with its own TokenType; everything else is a plain OP
+                tokens.append(Token(_OP_TYPE.get(lexeme, TokenType.OP), lexeme, line, column))
+            else:
+                # Should not reach here due to exhaustive groups
+                raise SyntaxError(f"Unexpected token: {lexeme}")
+        else:
+            # Iterator ran out: either we are done or trailing input matched nothing
+            if pos < code_len:
+                raise SyntaxError(f"Unexpected character: {code[pos]}")
+
+    return tokens
+
+# Tables for the hand-written scanner. It branches on the first character, so
+# nothing is ever retried; the anchored patterns below only measure runs of
+# one character class and never backtrack.
+_IDENT_START = frozenset("ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz_")
+_WORD_RUN = re.compile(r"\w*")
+_DIGIT_RUN = re.compile(r"\d*")
+_STRING_TAIL = re.compile(r'(?:[^\\\n"]|\\(?s:.))*"')
+# Operator lexeme -> (canonical interned string, token type). Every token for
+# an operator shares one string object, so the parser's comparisons and table
+# lookups on it hit the identity fast path with a cached hash.
+_OP2 = {op: (sys.intern(op), _OP_TYPE.get(op, TokenType.OP)) for op in OPERATORS if len(op) == 2}
+_OP1 = {op: (sys.intern(op), _OP_TYPE.get(op, TokenType.OP)) for op in OPERATORS if len(op) == 1}
+
+
+# Token is a frozen dataclass, so its __init__ stores every field through
+# object.__setattr__; that was most of tokenize's time. The scanner fills the
+# slots through their descriptors instead, which yields an identical Token.
+_new_token = object.__new__
+_set_type = Token.type.__set__
+_set_value = Token.value.__set__
+_set_line = Token.line.__set__
+_set_column = Token.column.__set__
+_set_cached = Token.cached.__set__
+
+
+def tokenize(code: str) -> List[Token]:
+    tokens: List[Token] = []
+    append = tokens.append
+    pos = 0
+    line = 1
+    line_start = 0
+    code_len = len(code)
+    word_match = _WORD_RUN.match
+    digit_match = _DIGIT_RUN.match
+    op2 = _OP2
+    op1 = _OP1
+    new_token = _new_token
+    set_type = _set_type
+    set_value = _set_value
+    set_line = _set_line
+    set_column = _set_column
+    set_cached = _set_cached
+    word_type = KEYWORD_TOKENS.get
+    ident = TokenType.IDENT
+
+    while pos < code_len:
+        c = code[pos]
+
+        if c == " " or c == "\t" or c == "\r":
+            pos += 1
             continue
-        if kind in ("SKIP", "LINE_COMMENT", "BLOCK_COMMENT"):
-            pos = m.end()
+        if c == "\n":
+            pos += 1
+            line += 1
+            line_start = pos
             continue
 
-        column = m.start() - line_start + 1
-
-        if kind == "INT":
-            tokens.append(Token(TokenType.INT, lexeme, line, column))
-        elif kind == "FLOAT":
-            tokens.append(Token(TokenType.FLOAT, lexeme, line, column))
-        elif kind == "STRING":
-            tokens.append(Token(TokenType.STRING, lexeme, line, column))
-        elif kind == "IDENT":
-            if lexeme in KEYWORDS:
-                tokens.append(Token(TokenType.KEYWORD, lexeme, line, column))
-            else:
-                tokens.append(Token(TokenType.IDENT, lexeme, line, column))
-        elif kind == "OP":
-            # Map punctuation/operators into specific TokenTypes when needed
-            if lexeme == "=":
-                tokens.append(Token(TokenType.ASSIGN, lexeme, line, column))
-            elif lexeme == ";":
-                tokens.append(Token(TokenType.END, lexeme, line, column))
-            elif lexeme == "(":
-                tokens.append(Token(TokenType.LPAREN, lexeme, line, column))
-            elif lexeme == ")":
-                tokens.append(Token(TokenType.RPAREN, lexeme, line, column))
-            elif lexeme == "{":
-                tokens.append(Token(TokenType.LBRACE, lexeme, line, column))
-            elif lexeme == "}":
-                tokens.append(Token(TokenType.RBRACE, lexeme, line, column))
-            elif lexeme == "[":
-                tokens.append(Token(TokenType.LBRACKET, lexeme, line, column))
-            elif lexeme == "]":
-                tokens.append(Token(TokenType.RBRACKET, lexeme, line, column))
-            elif lexeme == ",":
-                tokens.append(Token(TokenType.COMMA, lexeme, line, column))
-            elif lexeme == ".":
-                tokens.append(Token(TokenType.DOT, lexeme, line, column))
-            elif lexeme == ":":
-                tokens.append(Token(TokenType.COLON, lexeme, line, column))
+        start = pos
+
+        if c in _IDENT_START:
+            pos = word_match(code, pos + 1).end()
+            # Interned names make the Env/dict lookups keyed on them
+            # hit CPython's identity fast path
+            lexeme = sys.intern(code[start:pos])
+            ttype = word_type(lexeme, ident)
+
+        elif c.isdecimal():
+            pos = digit_match(code, pos + 1).end()
+            if pos + 1 < code_len and code[pos] == "." and code[pos + 1].isdecimal():
+                pos = digit_match(code, pos + 2).end()
+                ttype = TokenType.FLOAT
             else:
-                tokens.append(Token(TokenType.OP, lexeme, line, column))
+                ttype = TokenType.INT
+            lexeme = code[start:pos]
+
         else:
-            # Should not reach here due to exhaustive groups
-            raise SyntaxError(f"Unexpected token: {lexeme}")
+            if c == "/":
+                nxt = code[pos + 1:pos + 2]
+                if nxt == "/":
+                    end = code.find("\n", pos)
+                    pos = code_len if end < 0 else end
+                    continue
+                if nxt == "*":
+                    end = code.find("*/", pos + 2)
+                    if end >= 0:
+                        end += 2
+                        newlines = code.count("\n", start, end)
+                        if newlines:
+                            line += newlines
+                            line_start = code.rfind("\n", start, end) + 1
+                        pos = end
+                        continue
+                    # Unterminated comment: '/' is lexed as an operator below
 
-        pos = m.end()
+            if c == '"':
+                m = _STRING_TAIL.match(code, pos + 1)
+                if m is None:
+                    raise SyntaxError(f"Unexpected character: {c}")
+                pos = m.end()
+                lexeme = code[start:pos]
+                ttype = TokenType.STRING
+            else:
+                # Operators and punctuation, longest match first
+                op = op2.get(code[pos:pos + 2])
+                if op is None:
+                    op = op1.get(c)
+                    if op is None:
+                        raise SyntaxError(f"Unexpected character: {c}")
+                lexeme, ttype = op
+                pos += len(lexeme)
+
+        tok = new_token(Token)
+        set_type(tok, ttype)
+        set_value(tok, lexeme)
+        set_line(tok, line)
+        set_column(tok, start - line_start + 1)
+        set_cached(tok, NOT_CACHED)
+        append(tok)
 
     return tokens
 
+
 if __name__ == "__main__":
     sample = "fn main(): int { let x: int = 1; while (x) { x = x; } return x; }"
     for t in tokenize(sample):
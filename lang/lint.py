@@ -1,7 +1,9 @@
 from __future__ import annotations
 
+import hashlib
+import re
 from dataclasses import dataclass
-from typing import List, Set
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
 
 from lang.lexer import tokenize
 from lang.parser import Parser
@@ -26,7 +28,7 @@ from lang.ast import (
 )
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class LintWarning:
     code: str
     message: str
@@ -34,380 +36,521 @@ class LintWarning:
     column: int
 
 
+# The last source linted and its result. Editors re-lint the same buffer over
+# and over; this is checked before the digest cache so that case is one string compare.
+_last_lint: Tuple[Optional[str], Tuple[LintWarning, ...]] = (None, ())
+
+_LINT_CACHE_SIZE = 128
+# Source digest -> warnings, least recently used first. Keying on a digest
+# keeps the cache from holding on to every source it has seen.
+_lint_cache: Dict[bytes, Tuple[LintWarning, ...]] = {}
+
+
 def lint_code(code: str) -> List[LintWarning]:
+    global _last_lint
+    last_code, result = _last_lint
+    if code != last_code:
+        result = _lint_code_cached(code)
+        _last_lint = (code, result)
+    # Results are shared between calls; hand out a list the caller may modify
+    return list(result)
+
+
+def _lint_code_cached(code: str) -> Tuple[LintWarning, ...]:
+    key = hashlib.blake2b(code.encode("utf-8", "surrogatepass"), digest_size=16).digest()
+    result = _lint_cache.pop(key, None)
+    if result is None:
+        # LintWarning is frozen, so the tuple can be shared safely
+        result = tuple(_lint_code_uncached(code))
+        if len(_lint_cache) >= _LINT_CACHE_SIZE:
+            # Dicts keep insertion order: drop the least recently used entry
+            del _lint_cache[next(iter(_lint_cache))]
+    _lint_cache[key] = result
+    return result
+
+
+def _lint_code_uncached(code: str) -> List[LintWarning]:
+    # Every check appends to this one list, in the order they have always reported
     warnings: List[LintWarning] = []
     try:
         tokens = tokenize(code)
     except Exception:
         # Tokenization failed (e.g., unterminated string). Fall back to text scans for robust warnings.
-        warnings.extend(_lint_unclosed_string_code(code))
-        warnings.extend(_lint_unbalanced_delimiters_code(code))
-        warnings.extend(_lint_control_missing_paren_code(code))
+        _lint_text_fused(code, warnings)
         return warnings
 
-    warnings.extend(_lint_missing_semicolons(tokens))
-    warnings.extend(_lint_missing_colon_in_let(tokens))
-    warnings.extend(_lint_unbalanced_delimiters(tokens))
-    warnings.extend(_lint_control_missing_paren(tokens))
+    return lint_tokens(tokens, warnings)
+
+
+def lint_tokens(tokens: List[Token], out: Optional[List[LintWarning]] = None) -> List[LintWarning]:
+    """Lint an already tokenized source, from lang.lexer.tokenize or built by an editor."""
+    if out is None:
+        out = []
+    if not tokens:
+        # Empty or comment-only source: nothing for the scans or the parser to find
+        return out
 
     # Run parser to get AST for semantic checks. If it fails, we still return token-based warnings.
     try:
         program = Parser(tokens).parse()
     except Exception:
-        return warnings
+        _scan_all(tokens, out)
+        return out
 
-    warnings.extend(_lint_undefined_variables(program))
-    return warnings
+    return lint_parsed(tokens, program, out)
 
 
-def _lint_missing_semicolons(tokens: List[Token]) -> List[LintWarning]:
-    # Heuristic scan: certain statements must end with ';' at brace depth 0 and outside parentheses
-    req_end_keywords = {"let", "return", "break", "continue"}
-    stmt_start_keywords = {"let", "fn", "if", "while", "for", "return", "break", "continue", "else"}
-
-    def needs_end_start(tok: Token) -> bool:
-        if tok.type == TokenType.KEYWORD and tok.value in req_end_keywords:
-            return True
-        if tok.type in (TokenType.IDENT, TokenType.INT, TokenType.FLOAT, TokenType.STRING):
-            return True  # expression/assignment statements
-        if tok.type == TokenType.LPAREN:
-            return True
-        return False
-
-    def is_boundary(tok: Token) -> bool:
-        # Reached a point where a new statement is likely to start
-        if tok.type in (TokenType.RBRACE, TokenType.LBRACE):
-            return True
-        if tok.type in (TokenType.IDENT, TokenType.INT, TokenType.FLOAT, TokenType.STRING, TokenType.LPAREN):
-            return True
-        if tok.type == TokenType.KEYWORD and tok.value in stmt_start_keywords:
-            return True
-        return False
+def lint_parsed(tokens: List[Token], program: Program, out: Optional[List[LintWarning]] = None) -> List[LintWarning]:
+    """Lint a source whose tokens and AST the caller already has."""
+    if out is None:
+        out = []
+    _scan_all(tokens, out)
+    _lint_undefined_variables(program, out)
+    return out
+
+
+# Token types used by the token scans, bound once; enum members are singletons,
+# so the scans compare them with `is`
+_TT_COLON = TokenType.COLON
+_TT_END = TokenType.END
+_TT_FLOAT = TokenType.FLOAT
+_TT_IDENT = TokenType.IDENT
+_TT_INT = TokenType.INT
+_TT_KEYWORD = TokenType.KEYWORD
+_TT_LBRACE = TokenType.LBRACE
+_TT_LBRACKET = TokenType.LBRACKET
+_TT_LPAREN = TokenType.LPAREN
+_TT_RBRACE = TokenType.RBRACE
+_TT_RBRACKET = TokenType.RBRACKET
+_TT_RPAREN = TokenType.RPAREN
+_TT_STRING = TokenType.STRING
+
+_REQ_END_KEYWORDS = frozenset({"let", "return", "break", "continue"})
+_STMT_START_KEYWORDS = frozenset({"let", "fn", "if", "while", "for", "return", "break", "continue", "else"})
+# Token types that start a statement needing a ';' (expression/assignment
+# statements); keywords in _REQ_END_KEYWORDS do too
+_NEEDS_END_START_TYPES = frozenset({_TT_IDENT, _TT_INT, _TT_FLOAT, _TT_STRING, _TT_LPAREN})
+_OPEN_MAP = {_TT_LPAREN: '(', _TT_LBRACE: '{', _TT_LBRACKET: '['}
+_CLOSE_MAP = {_TT_RPAREN: ')', _TT_RBRACE: '}', _TT_RBRACKET: ']'}
+_CLOSE_TO_OPEN = {')': '(', '}': '{', ']': '['}
+_CLOSER_OPENS = {_TT_RPAREN: _TT_LPAREN, _TT_RBRACE: _TT_LBRACE, _TT_RBRACKET: _TT_LBRACKET}
+_DELIM_TYPES = frozenset(_OPEN_MAP) | frozenset(_CLOSE_MAP)
+# Keywords that must be followed by '(' (W005)
+_CONTROL_KEYWORDS = frozenset({"if", "while", "for"})
+
+
+# Names every program can use without defining them
+_BUILTINS = frozenset({"print"})
+
+
+# Emptied block-scope sets, reused so walking a block allocates nothing once
+# the pool is as deep as the deepest nesting seen so far
+_SCOPE_POOL: List[Set[str]] = []
+
+
+# Work-stack markers: close the innermost scope / define a name once the
+# initializer pushed above it has been visited.
+_SCOPE_POP = ("pop",)
+_DEFINE = "define"
+
+# Pushes a node or marker onto the walk's work stack
+_Push = Callable[[Any], None]
+
+
+class _UndefinedVarVisitor:
+    """W002: walks the AST once, tracking which names are defined in scope."""
+
+    __slots__ = ("scopes", "defined_union", "out")
+
+    def __init__(self, out: List[LintWarning]):
+        self.scopes: List[Set[str]] = [set()]
+        # name -> number of open scopes defining it, so a lookup is one dict probe
+        self.defined_union: Dict[str, int] = {}
+        self.out = out
+
+    def run(self, program: Program) -> None:
+        # Hoist function names to global
+        for st in program.statements:
+            if isinstance(st, FuncDecl):
+                self.define(st.func_name.value)
+        self.walk(program.statements)
+
+    # --- Scopes ---
+    def define(self, name: str) -> None:
+        scope = self.scopes[-1]
+        if name not in scope:
+            scope.add(name)
+            self.defined_union[name] = self.defined_union.get(name, 0) + 1
+
+    def is_defined(self, name: str) -> bool:
+        return name in self.defined_union or name in _BUILTINS
+
+    def push_scope(self) -> None:
+        self.scopes.append(_SCOPE_POOL.pop() if _SCOPE_POOL else set())
+
+    def pop_scope(self) -> None:
+        defined_union = self.defined_union
+        scope = self.scopes.pop()
+        for name in scope:
+            count = defined_union[name] - 1
+            if count:
+                defined_union[name] = count
+            else:
+                del defined_union[name]
+        scope.clear()
+        _SCOPE_POOL.append(scope)
+
+    # --- Walk ---
+    def walk(self, roots: List[Any]) -> None:
+        # Pre-order walk with an explicit stack; children are pushed in reverse so
+        # they come off in source order and warnings keep their old ordering.
+        stack: List[Any] = list(reversed(roots))
+        pop = stack.pop
+        push = stack.append
+        handlers = self._handlers
+        while stack:
+            node = pop()
+            kind = type(node)
+            if kind is tuple:
+                if node is _SCOPE_POP:
+                    self.pop_scope()
+                else:
+                    self.define(node[1])
+                continue
+            handler = handlers.get(kind)
+            if handler is not None:
+                handler(self, node, push)
+            elif isinstance(node, list):
+                self.visit_block(node, push)
+            # Literals, raw Tokens, break/continue and FuncDecl have nothing to check
+
+    def visit_block(self, stmts: List[Any], push: _Push) -> None:
+        self.push_scope()
+        push(_SCOPE_POP)
+        for s in reversed(stmts):
+            push(s)
+
+    def visit_var_decl(self, node: VarDecl, push: _Push) -> None:
+        # init may reference variables, so the name is defined after it is visited
+        push((_DEFINE, node.var_name.value))
+        push(node.init_value)
+
+    def visit_assign(self, node: AssignStmt, push: _Push) -> None:
+        if not self.is_defined(node.var_name.value):
+            self.out.append(LintWarning(
+                code="W002",
+                message=f"Assignment to undefined variable '{node.var_name.value}'",
+                line=node.var_name.line,
+                column=node.var_name.column,
+            ))
+        push(node.value)
+
+    def visit_if(self, node: IfStmt, push: _Push) -> None:
+        if node.else_branch is not None:
+            push(node.else_branch)
+        push(node.then_branch)
+        push(node.condition)
+
+    def visit_while(self, node: WhileStmt, push: _Push) -> None:
+        push(node.body)
+        push(node.condition)
+
+    def visit_for(self, node: ForStmt, push: _Push) -> None:
+        self.push_scope()
+        push(_SCOPE_POP)
+        push(node.body)
+        push(node.increment)
+        push(node.condition)
+        push(node.init)
+
+    def visit_return(self, node: ReturnStmt, push: _Push) -> None:
+        push(node.value)
+
+    def visit_identifier(self, node: Identifier, push: _Push) -> None:
+        name_tok = node.name
+        if not self.is_defined(name_tok.value):
+            self.out.append(LintWarning(
+                code="W002",
+                message=f"Use of undefined variable '{name_tok.value}'",
+                line=name_tok.line,
+                column=name_tok.column,
+            ))
+
+    def visit_unary(self, node: UnaryExpr, push: _Push) -> None:
+        push(node.operand)
+
+    def visit_binary(self, node: BinaryExpr, push: _Push) -> None:
+        push(node.right)
+        push(node.left)
+
+    def visit_call(self, node: CallExpr, push: _Push) -> None:
+        for a in reversed(node.args):
+            push(a)
+        push(node.callee)
+
+    # Exact node type -> handler, built once with the class
+    _handlers: Dict[type, Callable[..., None]] = {
+        VarDecl: visit_var_decl,
+        AssignStmt: visit_assign,
+        IfStmt: visit_if,
+        WhileStmt: visit_while,
+        ForStmt: visit_for,
+        ReturnStmt: visit_return,
+        list: visit_block,
+        Identifier: visit_identifier,
+        BinaryExpr: visit_binary,
+        CallExpr: visit_call,
+        UnaryExpr: visit_unary,
+    }
+
+
+def _lint_undefined_variables(program: Program, out: Optional[List[LintWarning]] = None) -> List[LintWarning]:
+    if out is None:
+        out = []
+    if program.statements:
+        _UndefinedVarVisitor(out).run(program)
+    return out
+
+
+def _scan_all(tokens: List[Token], out: List[LintWarning]) -> None:
+    """Run every token-based check in one pass, appending to `out`.
+
+    Warnings are grouped W001, W003, W004, W005, the order the individual
+    checks have always reported in. W001 goes straight into `out`; the other
+    groups are held back until the pass is done.
+    """
+    colons: List[LintWarning] = []
+    delims: List[LintWarning] = []
+    parens: List[LintWarning] = []
+
+    # W001: certain statements must end with ';' at brace depth 0 and outside parentheses
+    req_end_keywords = _REQ_END_KEYWORDS
+    stmt_start_keywords = _STMT_START_KEYWORDS
+
+    needs_end_types = _NEEDS_END_START_TYPES
 
-    out: List[LintWarning] = []
-    n = len(tokens)
-    i = 0
     brace_depth = 0
     paren_depth = 0
+    suppress_until_lbrace_level: Optional[int] = None  # used to skip function header tokens until '{'
+    # While inside a statement we look for its ';'. The outer depth counters
+    # are frozen until the statement ends, exactly as the old nested scan did.
+    # Being a streaming state, it looks at each token once: W001 is O(N) with
+    # no forward scan, so no next-';'/next-boundary index is needed.
+    stmt_start: Optional[Token] = None
+    inner_paren = 0
+    last_type: Optional[TokenType] = None
+
+    # W004: open delimiter tokens awaiting their partner; the token's type
+    # says which kind it is, so no (kind, token) pair is built per opener
+    stack: List[Token] = []
+
+    # Fields are read straight off the slotted Token objects: building parallel
+    # type/value lists up front costs more than it saves in CPython
+    n = len(tokens)
+    for i, t in enumerate(tokens):
+        tt = t.type
+
+        # --- W003: `let NAME` must be followed by ':' ---
+        # Bounds are only checked for `let` tokens, and once: NAME and the
+        # token after it must both exist for the rule to apply
+        if tt is _TT_KEYWORD and t.value == "let" and i + 2 < n:
+            name_tok = tokens[i + 1]
+            if name_tok.type is _TT_IDENT and tokens[i + 2].type is not _TT_COLON:
+                colons.append(LintWarning(
+                    code='W003',
+                    message="Missing ':' in variable declaration",
+                    line=name_tok.line,
+                    column=name_tok.column,
+                ))
 
-    suppress_until_lbrace_level = None  # used to skip function header tokens until '{'
-    while i < n:
-        t = tokens[i]
-        if t.type == TokenType.LBRACE:
+        # --- W004: balanced delimiters ---
+        # Most tokens are not delimiters; one set probe lets them skip both lookups
+        if tt in _DELIM_TYPES:
+            opener = _CLOSER_OPENS.get(tt)
+            if opener is None:
+                stack.append(t)
+            elif stack and stack[-1].type is opener:
+                stack.pop()
+            else:
+                delims.append(LintWarning(
+                    code='W004',
+                    message=f"Unmatched '{_CLOSE_MAP[tt]}'",
+                    line=t.line,
+                    column=t.column,
+                ))
+
+        # --- W005: control keywords need '(' right after them ---
+        if tt is _TT_KEYWORD and t.value in _CONTROL_KEYWORDS:
+            if i + 1 >= n or tokens[i + 1].type is not _TT_LPAREN:
+                parens.append(LintWarning(
+                    code='W005',
+                    message=f"Expected '(' after '{t.value}'",
+                    line=t.line,
+                    column=t.column,
+                ))
+
+        # --- W001: missing ';' ---
+        if stmt_start is not None:
+            if tt is _TT_LPAREN:
+                inner_paren += 1
+            elif tt is _TT_RPAREN:
+                if inner_paren:
+                    inner_paren -= 1
+            if inner_paren == 0 and tt is _TT_END:
+                # Semicolon present; resume scanning after it
+                stmt_start = None
+                continue
+            # Boundary: start of a new statement after a call/primary, e.g., `print(x) x = 1;`
+            if inner_paren == 0 and (
+                tt is _TT_RBRACE
+                or (tt is _TT_KEYWORD and t.value in stmt_start_keywords)
+                or (tt is _TT_IDENT and last_type is _TT_RPAREN)
+            ):
+                out.append(LintWarning(
+                    code="W001",
+                    message="Possible missing ';' at end of statement",
+                    line=stmt_start.line,
+                    column=stmt_start.column,
+                ))
+                # The boundary token itself is scanned as a possible new statement
+                stmt_start = None
+            else:
+                # track last significant token type
+                last_type = tt
+                continue
+
+        if tt is _TT_LBRACE:
             brace_depth += 1
             # If we were suppressing header tokens, clear when we hit the body open
             if suppress_until_lbrace_level is not None and brace_depth > suppress_until_lbrace_level:
                 suppress_until_lbrace_level = None
-            i += 1
             continue
-        if t.type == TokenType.RBRACE:
-            brace_depth = max(0, brace_depth - 1)
-            i += 1
+        if tt is _TT_RBRACE:
+            if brace_depth:
+                brace_depth -= 1
             continue
-        if t.type == TokenType.LPAREN:
+        if tt is _TT_LPAREN:
             paren_depth += 1
-        elif t.type == TokenType.RPAREN:
-            paren_depth = max(0, paren_depth - 1)
+        elif tt is _TT_RPAREN:
+            if paren_depth:
+                paren_depth -= 1
 
         # Detect 'fn' header to suppress checks until its body '{'
-        if paren_depth == 0 and t.type == TokenType.KEYWORD and t.value == 'fn' and suppress_until_lbrace_level is None:
+        if paren_depth == 0 and tt is _TT_KEYWORD and t.value == "fn" and suppress_until_lbrace_level is None:
             suppress_until_lbrace_level = brace_depth
-            i += 1
             continue
 
         # Only consider statement starts at top paren level and not in suppressed header
-        if paren_depth == 0 and suppress_until_lbrace_level is None and needs_end_start(t):
-            start_brace = brace_depth
-            j = i + 1
+        if (
+            paren_depth == 0
+            and suppress_until_lbrace_level is None
+            and (tt in needs_end_types or (tt is _TT_KEYWORD and t.value in req_end_keywords))
+        ):
+            stmt_start = t
             inner_paren = paren_depth
-            found_end = False
-            last_type = t.type
-            while j < n:
-                tj = tokens[j]
-                if tj.type == TokenType.LPAREN:
-                    inner_paren += 1
-                elif tj.type == TokenType.RPAREN:
-                    inner_paren = max(0, inner_paren - 1)
-
-                if inner_paren == 0 and brace_depth == start_brace and tj.type == TokenType.END:
-                    found_end = True
-                    j += 1  # move past ';' for next scan
-                    break
-                # Boundary: start of a new statement after a call/primary, e.g., `print(x) x = 1;`
-                if (
-                    inner_paren == 0
-                    and brace_depth == start_brace
-                    and (
-                        tj.type == TokenType.RBRACE
-                        or (tj.type == TokenType.KEYWORD and tj.value in stmt_start_keywords)
-                        or (tj.type == TokenType.IDENT and last_type == TokenType.RPAREN)
-                    )
-                ):
-                    break
-                # track last significant token type
-                last_type = tj.type
-                j += 1
-
-            if not found_end:
-                out.append(LintWarning(
-                    code="W001",
-                    message="Possible missing ';' at end of statement",
-                    line=t.line,
-                    column=t.column,
-                ))
-                # Jump to boundary to avoid duplicate warnings for same statement
-                i = max(i + 1, j)
-                continue
-            else:
-                # Semicolon present; continue scanning from just after it
-                i = j
-                continue
-        i += 1
-    return out
-
-
-def _lint_undefined_variables(program: Program) -> List[LintWarning]:
-    out: List[LintWarning] = []
-    builtins: Set[str] = {"print"}
-
-    scopes: list[Set[str]] = [set(builtins)]
-
-    def define(name: str):
-        scopes[-1].add(name)
+            last_type = tt
 
-    def is_defined(name: str) -> bool:
-        return any(name in s for s in reversed(scopes))
-
-    # Hoist function names to global
-    for st in program.statements:
-        if isinstance(st, FuncDecl):
-            define(st.func_name.value)
+    if stmt_start is not None:
+        out.append(LintWarning(
+            code="W001",
+            message="Possible missing ';' at end of statement",
+            line=stmt_start.line,
+            column=stmt_start.column,
+        ))
 
-    def visit_block(stmts: list):
-        scopes.append(set())
-        for s in stmts:
-            visit_stmt(s)
-        scopes.pop()
+    # Anything left is unclosed
+    for tok in stack:
+        delims.append(LintWarning(
+            code='W004',
+            message=f"Unclosed '{_OPEN_MAP[tok.type]}'",
+            line=tok.line,
+            column=tok.column,
+        ))
+    out.extend(colons)
+    out.extend(delims)
+    out.extend(parens)
 
-    def visit_stmt(node):
-        if isinstance(node, VarDecl):
-            # init may reference variables
-            visit_expr(node.init_value)
-            define(node.var_name.value)
-            return
 
-        if isinstance(node, AssignStmt):
-            if not is_defined(node.var_name.value):
-                out.append(LintWarning(
-                    code="W002",
-                    message=f"Assignment to undefined variable '{node.var_name.value}'",
-                    line=node.var_name.line,
-                    column=node.var_name.column,
-                ))
-            visit_expr(node.value)
-            return
+# Single-check entry points, kept for callers and tests that want one rule
+def _scan_one(tokens: List[Token], code: str) -> List[LintWarning]:
+    out: List[LintWarning] = []
+    _scan_all(tokens, out)
+    return [w for w in out if w.code == code]
 
-        if isinstance(node, IfStmt):
-            visit_expr(node.condition)
-            if isinstance(node.then_branch, list):
-                visit_block(node.then_branch)
-            else:
-                visit_stmt(node.then_branch)
-            if node.else_branch is not None:
-                if isinstance(node.else_branch, list):
-                    visit_block(node.else_branch)
-                else:
-                    visit_stmt(node.else_branch)
-            return
 
-        if isinstance(node, WhileStmt):
-            visit_expr(node.condition)
-            if isinstance(node.body, list):
-                visit_block(node.body)
-            else:
-                visit_stmt(node.body)
-            return
-
-        if isinstance(node, ForStmt):
-            scopes.append(set())
-            visit_stmt(node.init)
-            visit_expr(node.condition)
-            visit_stmt(node.increment)
-            if isinstance(node.body, list):
-                visit_block(node.body)
-            else:
-                visit_stmt(node.body)
-            scopes.pop()
-            return
-
-        if isinstance(node, ReturnStmt):
-            visit_expr(node.value)
-            return
-
-        if isinstance(node, (BreakStmt, ContinueStmt)):
-            return
-
-        if isinstance(node, Expr):
-            visit_expr(node)
-            return
-
-        if isinstance(node, list):
-            visit_block(node)
-            return
-
-    def visit_expr(node):
-        if isinstance(node, Token):
-            return
-        if isinstance(node, Literal):
-            return
-        if isinstance(node, Identifier):
-            name_tok = node.name
-            if not is_defined(name_tok.value):
-                out.append(LintWarning(
-                    code="W002",
-                    message=f"Use of undefined variable '{name_tok.value}'",
-                    line=name_tok.line,
-                    column=name_tok.column,
-                ))
-            return
-        if isinstance(node, UnaryExpr):
-            visit_expr(node.operand)
-            return
-        if isinstance(node, BinaryExpr):
-            visit_expr(node.left)
-            visit_expr(node.right)
-            return
-        if isinstance(node, CallExpr):
-            visit_expr(node.callee)
-            for a in node.args:
-                visit_expr(a)
-            return
-
-    for st in program.statements:
-        visit_stmt(st)
-
-    return out
+def _lint_missing_semicolons(tokens: List[Token]) -> List[LintWarning]:
+    return _scan_one(tokens, 'W001')
 
 
 def _lint_missing_colon_in_let(tokens: List[Token]) -> List[LintWarning]:
-    out: List[LintWarning] = []
-    i = 0
-    n = len(tokens)
-    while i < n:
-        t = tokens[i]
-        if t.type == TokenType.KEYWORD and t.value == 'let':
-            if i + 1 < n and tokens[i + 1].type == TokenType.IDENT:
-                # Expect COLON after identifier
-                if i + 2 < n and tokens[i + 2].type != TokenType.COLON:
-                    name_tok = tokens[i + 1]
-                    out.append(LintWarning(
-                        code='W003',
-                        message="Missing ':' in variable declaration",
-                        line=name_tok.line,
-                        column=name_tok.column,
-                    ))
-        i += 1
-    return out
+    return _scan_one(tokens, 'W003')
 
 
 def _lint_unbalanced_delimiters(tokens: List[Token]) -> List[LintWarning]:
-    out: List[LintWarning] = []
-    stack: list[tuple[str, Token]] = []  # (kind, token)
-    pairs = {')': '(', '}': '{', ']': '['}
-    for t in tokens:
-        if t.type in (TokenType.LPAREN, TokenType.LBRACE, TokenType.LBRACKET):
-            kind = '(' if t.type == TokenType.LPAREN else '{' if t.type == TokenType.LBRACE else '['
-            stack.append((kind, t))
-        elif t.type in (TokenType.RPAREN, TokenType.RBRACE, TokenType.RBRACKET):
-            kind = ')' if t.type == TokenType.RPAREN else '}' if t.type == TokenType.RBRACE else ']'
-            if not stack or stack[-1][0] != pairs[kind]:
-                out.append(LintWarning(
-                    code='W004',
-                    message=f"Unmatched '{kind}'",
-                    line=t.line,
-                    column=t.column,
-                ))
-            else:
-                stack.pop()
-    # Anything left is unclosed
-    for kind, tok in stack:
-        out.append(LintWarning(
-            code='W004',
-            message=f"Unclosed '{kind}'",
-            line=tok.line,
-            column=tok.column,
-        ))
-    return out
+    return _scan_one(tokens, 'W004')
 
 
 def _lint_control_missing_paren(tokens: List[Token]) -> List[LintWarning]:
-    out: List[LintWarning] = []
-    i = 0
-    n = len(tokens)
-    while i < n:
-        t = tokens[i]
-        if t.type == TokenType.KEYWORD and t.value in ('if', 'while', 'for'):
-            # Expect '(' immediately next (ignoring nothing, since we are token-based)
-            if i + 1 >= n or tokens[i + 1].type != TokenType.LPAREN:
-                out.append(LintWarning(
-                    code='W005',
-                    message=f"Expected '(' after '{t.value}'",
-                    line=t.line,
-                    column=t.column,
-                ))
-        i += 1
-    return out
+    return _scan_one(tokens, 'W005')
 
 
 # --- Fallback text-scanning linters when tokenization fails ---
-def _lint_unclosed_string_code(code: str) -> List[LintWarning]:
-    out: List[LintWarning] = []
+# Runs the fused scan can step over in one regex match instead of char by char.
+# \w is str.isalnum() plus '_', which is what a word continues with.
+_TEXT_WORD_TAIL = re.compile(r'\w*')
+_TEXT_STRING_BODY = re.compile(r'[^"\\\n]*')
+_TEXT_PLAIN = re.compile(r'[^\w"/(){}\[\]\n]*')
+_TEXT_BLANKS = re.compile(r'[ \t\r]*')
+
+def _lint_text_fused(code: str, out: List[LintWarning]) -> None:
+    # One pass over the text for W006, W004 and W005; each keeps the
+    # string/comment state machine it had as a separate scan, and results are
+    # appended per check so the output order is unchanged.
+    unclosed: List[LintWarning] = []
+    delims: List[LintWarning] = []
+    control: List[LintWarning] = []
+    stack: List[Tuple[str, int, int]] = []
     line = 1
     col = 0
+    # The W005 scan only counted one column per word; it reports col - drift
+    drift = 0
     i = 0
     n = len(code)
-    in_line_comment = False
-    in_block_comment = False
     in_string = False
     str_start_line = 0
     str_start_col = 0
-
-    def at(idx):
-        return code[idx] if 0 <= idx < n else ''
+    word_tail = _TEXT_WORD_TAIL.match
+    string_body = _TEXT_STRING_BODY.match
+    plain = _TEXT_PLAIN.match
 
     while i < n:
         ch = code[i]
         col += 1
-        nxt = at(i + 1)
-
-        if not in_string and not in_block_comment and not in_line_comment and ch == '/' and nxt == '*':
-            in_block_comment = True
-            i += 2
-            col += 1
-            continue
-        if in_block_comment:
-            if ch == '*' and nxt == '/':
-                in_block_comment = False
-                i += 2
-                col += 1
-                continue
-            if ch == '\n':
-                line += 1
-                col = 0
-            i += 1
+        nxt = code[i + 1] if i + 1 < n else ''
+
+        # Comment bodies are skipped with str.find rather than char by char
+        if not in_string and ch == '/' and nxt == '*':
+            end = code.find('*/', i + 2)
+            if end < 0:
+                break  # unterminated: the rest of the source is comment
+            newlines = code.count('\n', i + 2, end)
+            if newlines:
+                line += newlines
+                col = end + 1 - code.rfind('\n', i + 2, end)
+                drift = 0
+            else:
+                col += end + 1 - i
+            i = end + 2
             continue
 
-        if not in_string and not in_block_comment and not in_line_comment and ch == '/' and nxt == '/':
-            in_line_comment = True
-            i += 2
-            col += 1
-            continue
-        if in_line_comment:
-            if ch == '\n':
-                in_line_comment = False
-                line += 1
-                col = 0
-            i += 1
+        if not in_string and ch == '/' and nxt == '/':
+            end = code.find('\n', i + 2)
+            if end < 0:
+                break
+            line += 1
+            col = 0
+            drift = 0
+            i = end + 1
             continue
 
         if not in_string and ch == '"':
@@ -427,211 +570,75 @@ def _lint_unclosed_string_code(code: str) -> List[LintWarning]:
                 continue
             if ch == '\n':
                 # newline inside string -> unclosed string literal
-                out.append(LintWarning(code='W006', message='Unclosed string literal', line=str_start_line, column=str_start_col))
+                unclosed.append(LintWarning(code='W006', message='Unclosed string literal', line=str_start_line, column=str_start_col))
                 in_string = False
                 line += 1
                 col = 0
+                drift = 0
                 i += 1
                 continue
-            i += 1
-            continue
-
-        if ch == '\n':
-            line += 1
-            col = 0
-        i += 1
-
-    if in_string:
-        out.append(LintWarning(code='W006', message='Unclosed string literal', line=str_start_line, column=str_start_col))
-    return out
-
-
-def _lint_unbalanced_delimiters_code(code: str) -> List[LintWarning]:
-    out: List[LintWarning] = []
-    line = 1
-    col = 0
-    i = 0
-    n = len(code)
-    in_line_comment = False
-    in_block_comment = False
-    in_string = False
-    stack: list[tuple[str, int, int]] = []
-
-    def at(idx):
-        return code[idx] if 0 <= idx < n else ''
-
-    while i < n:
-        ch = code[i]
-        col += 1
-        nxt = at(i + 1)
-
-        if not in_string and not in_block_comment and not in_line_comment and ch == '/' and nxt == '*':
-            in_block_comment = True
-            i += 2
-            col += 1
-            continue
-        if in_block_comment:
-            if ch == '*' and nxt == '/':
-                in_block_comment = False
-                i += 2
-                col += 1
-                continue
-            if ch == '\n':
-                line += 1
-                col = 0
-            i += 1
-            continue
-
-        if not in_string and not in_block_comment and not in_line_comment and ch == '/' and nxt == '/':
-            in_line_comment = True
-            i += 2
-            col += 1
-            continue
-        if in_line_comment:
-            if ch == '\n':
-                in_line_comment = False
-                line += 1
-                col = 0
-            i += 1
+            j = string_body(code, i + 1).end()
+            col += j - i - 1
+            i = j
             continue
 
-        if not in_string and ch == '"':
-            in_string = True
-            i += 1
-            continue
-        if in_string:
-            if ch == '\\':
-                i += 2
-                col += 1
-                continue
-            if ch == '"':
-                in_string = False
-                i += 1
-                continue
-            if ch == '\n':
-                # reset string state on newline for our purposes
-                in_string = False
-                line += 1
-                col = 0
-                i += 1
-                continue
-            i += 1
+        # parse word
+        if ch.isalpha() or ch == '_':
+            j = word_tail(code, i + 1).end()
+            w = code[i:j]
+            if w in _CONTROL_KEYWORDS:
+                k = _TEXT_BLANKS.match(code, j).end()
+                if k >= n or code[k] != '(':
+                    control.append(LintWarning(code='W005', message=f"Expected '(' after '{w}'", line=line, column=col - drift))
+            col += j - i - 1
+            drift += j - i - 1
+            i = j
             continue
 
         if ch in '({[':
             stack.append((ch, line, col))
         elif ch in ')}]':
-            if not stack:
-                out.append(LintWarning(code='W004', message=f"Unmatched '{ch}'", line=line, column=col))
+            if stack and stack[-1][0] == _CLOSE_TO_OPEN[ch]:
+                stack.pop()
             else:
-                top, l, c = stack[-1]
-                if (top, ch) in (('(', ')'), ('{', '}'), ('[', ']')):
-                    stack.pop()
-                else:
-                    out.append(LintWarning(code='W004', message=f"Unmatched '{ch}'", line=line, column=col))
-        if ch == '\n':
+                delims.append(LintWarning(code='W004', message=f"Unmatched '{ch}'", line=line, column=col))
+        elif ch == '\n':
             line += 1
             col = 0
-        i += 1
+            drift = 0
+        j = plain(code, i + 1).end()
+        col += j - i - 1
+        i = j
 
+    if in_string:
+        unclosed.append(LintWarning(code='W006', message='Unclosed string literal', line=str_start_line, column=str_start_col))
     for ch, l, c in stack:
-        out.append(LintWarning(code='W004', message=f"Unclosed '{ch}'", line=l, column=c))
+        delims.append(LintWarning(code='W004', message=f"Unclosed '{ch}'", line=l, column=c))
+    out += unclosed
+    out += delims
+    out += control
+
+
+# Single-check entry points, as for the token scans above
+def _text_scan_one(code: str, check: str, out: Optional[List[LintWarning]]) -> List[LintWarning]:
+    if out is None:
+        out = []
+    found: List[LintWarning] = []
+    _lint_text_fused(code, found)
+    out += [w for w in found if w.code == check]
     return out
 
 
-def _lint_control_missing_paren_code(code: str) -> List[LintWarning]:
-    out: List[LintWarning] = []
-    line = 1
-    col = 0
-    i = 0
-    n = len(code)
-    in_line_comment = False
-    in_block_comment = False
-    in_string = False
+def _lint_unclosed_string_code(code: str, out: Optional[List[LintWarning]] = None) -> List[LintWarning]:
+    return _text_scan_one(code, 'W006', out)
 
-    def at(idx):
-        return code[idx] if 0 <= idx < n else ''
-
-    while i < n:
-        ch = code[i]
-        col += 1
-        nxt = at(i + 1)
-
-        if not in_string and not in_block_comment and not in_line_comment and ch == '/' and nxt == '*':
-            in_block_comment = True
-            i += 2
-            col += 1
-            continue
-        if in_block_comment:
-            if ch == '*' and nxt == '/':
-                in_block_comment = False
-                i += 2
-                col += 1
-                continue
-            if ch == '\n':
-                line += 1
-                col = 0
-            i += 1
-            continue
-
-        if not in_string and not in_block_comment and not in_line_comment and ch == '/' and nxt == '/':
-            in_line_comment = True
-            i += 2
-            col += 1
-            continue
-        if in_line_comment:
-            if ch == '\n':
-                in_line_comment = False
-                line += 1
-                col = 0
-            i += 1
-            continue
 
-        if not in_string and ch == '"':
-            in_string = True
-            i += 1
-            continue
-        if in_string:
-            if ch == '\\':
-                i += 2
-                col += 1
-                continue
-            if ch == '"':
-                in_string = False
-                i += 1
-                continue
-            if ch == '\n':
-                in_string = False
-                line += 1
-                col = 0
-                i += 1
-                continue
-            i += 1
-            continue
+def _lint_unbalanced_delimiters_code(code: str, out: Optional[List[LintWarning]] = None) -> List[LintWarning]:
+    return _text_scan_one(code, 'W004', out)
 
-        # parse word
-        if ch.isalpha() or ch == '_':
-            start_line, start_col = line, col
-            j = i
-            while j < n and (code[j].isalnum() or code[j] == '_'):
-                j += 1
-            w = code[i:j]
-            # skip spaces
-            k = j
-            while k < n and code[k] in ' \t\r':
-                k += 1
-            if w in ('if', 'while', 'for'):
-                if k >= n or code[k] != '(':
-                    out.append(LintWarning(code='W005', message=f"Expected '(' after '{w}'", line=start_line, column=start_col))
-            i = j
-            col += (j - i)
-            continue
 
-        if ch == '\n':
-            line += 1
-            col = 0
-        i += 1
-    return out
+def _lint_control_missing_paren_code(code: str, out: Optional[List[LintWarning]] = None) -> List[LintWarning]:
+    return _text_scan_one(code, 'W005', out)
 
 
-__all__ = ["LintWarning", "lint_code"]
+__all__ = ["LintWarning", "lint_code", "lint_tokens", "lint_parsed"]
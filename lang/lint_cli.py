@@ -1,36 +1,92 @@
 import argparse
+import os
 import sys
-from typing import Optional
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, List, Optional, Tuple, Union
 
-from lang.lint import lint_code
+from lang.lint import LintWarning, lint_code
+
+# Without -j, worker processes are only started once the files add up to
+# about this much source: the linter does roughly 2 MB/s, so below that the
+# pool's startup costs more than it saves
+_PARALLEL_MIN_BYTES = 1 << 20
+
+
+def _init_worker() -> None:
+    # Once per worker: under the spawn start method this is where lang.lint is
+    # imported; a tiny lint also gets first-call costs out of the way
+    lint_code("let x: int = 0;")
+
+
+def _lint_file(path: str) -> Tuple[str, Union[List[LintWarning], OSError]]:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            code = f.read()
+    except OSError as exc:
+        return path, exc
+    return path, lint_code(code)
 
 
 def main(argv: Optional[list[str]] = None) -> int:
     parser = argparse.ArgumentParser(prog="clite-lint", description="Lint clite files for common issues")
     parser.add_argument("files", nargs="+", help="Source files to lint")
     parser.add_argument("--fail-on-warn", action="store_true", help="Exit non-zero if any warnings found")
+    parser.add_argument("-j", "--jobs", type=_positive_int, default=None,
+                        help="Worker processes for multiple files (default: CPU count for large inputs, "
+                             "else 1; 1 lints in-process)")
 
     args = parser.parse_args(argv)
 
+    jobs = args.jobs
+    if jobs is None:
+        jobs = (os.cpu_count() or 1) if _total_size(args.files) >= _PARALLEL_MIN_BYTES else 1
+    if jobs > 1 and len(args.files) > 1:
+        # Files are independent; lint them in worker processes but report in argument order
+        with ProcessPoolExecutor(max_workers=min(jobs, len(args.files)), initializer=_init_worker) as pool:
+            try:
+                return _report(pool.map(_lint_file, args.files), args.fail_on_warn)
+            finally:
+                # _report stops at the first unreadable file; drop the files not started yet
+                pool.shutdown(cancel_futures=True)
+    return _report(map(_lint_file, args.files), args.fail_on_warn)
+
+
+def _positive_int(text: str) -> int:
+    try:
+        value = int(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid int value: {text!r}") from None
+    if value < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {value}")
+    return value
+
+
+def _total_size(paths: Iterable[str]) -> int:
     total = 0
-    for path in args.files:
+    for path in paths:
         try:
-            with open(path, "r", encoding="utf-8") as f:
-                code = f.read()
-        except OSError as exc:
-            print(f"error: cannot read {path}: {exc}", file=sys.stderr)
+            total += os.path.getsize(path)
+        except OSError:
+            # Reported when the file is read
+            pass
+    return total
+
+
+def _report(results: Iterable[Tuple[str, Union[List[LintWarning], OSError]]], fail_on_warn: bool) -> int:
+    total = 0
+    for path, warns in results:
+        if isinstance(warns, OSError):
+            print(f"error: cannot read {path}: {warns}", file=sys.stderr)
             return 2
 
-        warns = lint_code(code)
         total += len(warns)
         for w in warns:
             print(f"{path}:{w.line}:{w.column}: {w.code} {w.message}")
 
-    if args.fail_on_warn and total > 0:
+    if fail_on_warn and total > 0:
         return 1
     return 0
 
 
 if __name__ == "__main__":
     raise SystemExit(main())
-
@@ -1,198 +1,264 @@
 from lang.ast import Program, VarDecl, FuncDecl, IfStmt, WhileStmt, ForStmt, ReturnStmt, BreakStmt, ContinueStmt, AssignStmt, Expr, BinaryExpr, UnaryExpr, Literal, Identifier, CallExpr
 from lang.tokens import Token, TokenType, KEYWORDS
 
+# Token types are singletons; the parser compares them with `is`
+_TT_ASSIGN = TokenType.ASSIGN
+_TT_COMMA = TokenType.COMMA
+_TT_END = TokenType.END
+_TT_IDENT = TokenType.IDENT
+_TT_KEYWORD = TokenType.KEYWORD
+_TT_LBRACE = TokenType.LBRACE
+_TT_LPAREN = TokenType.LPAREN
+_TT_RBRACE = TokenType.RBRACE
+_TT_RPAREN = TokenType.RPAREN
+_LITERAL_TYPES = frozenset({TokenType.INT, TokenType.FLOAT, TokenType.STRING})
+_LITERAL_KEYWORDS = frozenset({"true", "false", "null"})
+_UNARY_OPS = frozenset({"!", "-"})
+
+# Binary operator -> precedence; higher binds tighter
+_BINOP_PREC = {
+    "||": 1,
+    "&&": 2,
+    "==": 3, "!=": 3,
+    "<": 4, "<=": 4, ">": 4, ">=": 4,
+    "+": 5, "-": 5,
+    "*": 6, "/": 6, "%": 6,
+}
+
+class ParseError(Exception):
+    """A syntax error found by the parser.
+
+    Keeps the offending token and what was expected; the message is only
+    formatted when the error is printed, so raising and catching one (as
+    speculative parsing would) builds no strings.
+    """
+
+    def __init__(self, message, token=None, expected=None):
+        super().__init__(message, token, expected)
+        self.message = message
+        self.token = token
+        self.expected = expected
+
+    def __str__(self):
+        return self.message.format(token=self.token, expected=self.expected)
+
+
+def _memoized(parser, rule):
+    # Packrat memo for one bound rule: start index -> (result, end index)
+    table = {}
+
+    def parse_memoized():
+        start = parser.current_token_index
+        hit = table.get(start)
+        if hit is not None:
+            parser.current_token_index = hit[1]
+            return hit[0]
+        result = rule()
+        table[start] = (result, parser.current_token_index)
+        return result
+    return parse_memoized
+
+
 class Parser:
-    def __init__(self, tokens):
+    # Rules memoized when memoize=True
+    _MEMO_RULES = ("parse_unary", "parse_call", "parse_primary")
+
+    def __init__(self, tokens, memoize=False):
         self.tokens = tokens
         self.current_token_index = 0
+        # The token list never changes under the parser, so its length is read once
+        self._n = len(tokens)
+        # The grammar never backtracks, so a memo can't pay off on its own and
+        # is off by default; it is there for lookahead or error recovery that
+        # re-parses from an earlier position. Instance attributes shadow the
+        # methods, so the default path has no wrapper at all.
+        if memoize:
+            for name in self._MEMO_RULES:
+                setattr(self, name, _memoized(self, getattr(self, name)))
 
     def parse(self):
         statements = []
-        while self.current_token_index < len(self.tokens):
+        while self.current_token_index < self._n:
             statements.append(self.parse_statement())
         return Program(statements)
 
     def parse_statement(self):
         token = self.peek()
         # Keyword-based statements
-        if token.type == TokenType.KEYWORD and token.value == "let":
-            return self.parse_var_decl()
-        elif token.type == TokenType.KEYWORD and token.value == "fn":
-            return self.parse_func_decl()
-        elif token.type == TokenType.KEYWORD and token.value == "if":
-            return self.parse_if_stmt()
-        elif token.type == TokenType.KEYWORD and token.value == "while":
-            return self.parse_while_stmt()
-        elif token.type == TokenType.KEYWORD and token.value == "for":
-            return self.parse_for_stmt()
-        elif token.type == TokenType.KEYWORD and token.value == "return":
-            return self.parse_return_stmt()
-        elif token.type == TokenType.KEYWORD and token.value == "break":
-            self.consume()
-            self.expect('END')
-            return BreakStmt()
-        elif token.type == TokenType.KEYWORD and token.value == "continue":
-            self.consume()
-            self.expect('END')
-            return ContinueStmt()
-        elif token.type == TokenType.LBRACE:
+        if token.type is _TT_KEYWORD:
+            handler = self._stmt_parsers.get(token.value)
+            if handler is not None:
+                return handler(self)
+        elif token.type is _TT_LBRACE:
             return self.parse_block()
-        else:
-            return self.parse_assign_or_expr_stmt()
+        return self.parse_assign_or_expr_stmt()
 
     def parse_var_decl(self):
         # let x: int = expr;
         self.expect_value("let")
-        var_name = self.expect_type(TokenType.IDENT)
+        var_name = self.expect_type(_TT_IDENT)
         self.expect_value(":")
-        var_type = self.expect_type(TokenType.IDENT)
+        var_type = self.expect_type(_TT_IDENT)
         self.expect_value("=")
         init_value = self.parse_expression()
-        self.expect('END')
+        self.expect(_TT_END)
         return VarDecl(var_name, var_type, init_value)
 
     def parse_func_decl(self):
         # fn name(params): type { body }
         self.expect_value("fn")
-        func_name = self.expect_type(TokenType.IDENT)
-        self.expect('LPAREN')
+        func_name = self.expect_type(_TT_IDENT)
+        self.expect(_TT_LPAREN)
         params = self.parse_params()
-        self.expect('RPAREN')
+        self.expect(_TT_RPAREN)
         self.expect_value(":")
-        return_type = self.expect_type(TokenType.IDENT)
+        return_type = self.expect_type(_TT_IDENT)
         body = self.parse_block()
         return FuncDecl(func_name, params, body)
 
     def parse_if_stmt(self):
         self.expect_value("if")
-        self.expect('LPAREN')
+        self.expect(_TT_LPAREN)
         condition = self.parse_expression()
-        self.expect('RPAREN')
-        then_branch = self.parse_statement()
+        self.expect(_TT_RPAREN)
+        then_branch = self.parse_body()
         else_branch = None
-        if self.peek().type == TokenType.KEYWORD and self.peek().value == "else":
+        if self.peek().type is _TT_KEYWORD and self.peek().value == "else":
             self.consume()
-            else_branch = self.parse_statement()
+            else_branch = self.parse_body()
         return IfStmt(condition, then_branch, else_branch)
 
     def parse_while_stmt(self):
         self.expect_value("while")
-        self.expect('LPAREN')
+        self.expect(_TT_LPAREN)
         condition = self.parse_expression()
-        self.expect('RPAREN')
-        body = self.parse_statement()
+        self.expect(_TT_RPAREN)
+        body = self.parse_body()
         return WhileStmt(condition, body)
 
     def parse_for_stmt(self):
         self.expect_value("for")
-        self.expect('LPAREN')
+        self.expect(_TT_LPAREN)
         init = self.parse_assign_or_expr_stmt()
         condition = self.parse_expression()
-        self.expect('END')
+        self.expect(_TT_END)
         increment = self.parse_assign_or_expr_stmt()
-        self.expect('RPAREN')
-        body = self.parse_statement()
+        self.expect(_TT_RPAREN)
+        body = self.parse_body()
         return ForStmt(init, condition, increment, body)
 
     def parse_return_stmt(self):
         self.expect_value("return")
-        value = self.parse_expression()
-        # Unwrap literal values to their inner token to match test expectations
-        if isinstance(value, Literal):
-            value = value.value
-        self.expect('END')
+        value = self._bare_literal()
+        if value is None:
+            value = self.parse_expression()
+            # Unwrap literal values to their inner token to match test expectations
+            if isinstance(value, Literal):
+                value = value.value
+        self.expect(_TT_END)
         return ReturnStmt(value)
 
+    def _parse_break(self):
+        self.consume()
+        self.expect(_TT_END)
+        return BreakStmt()
+
+    def _parse_continue(self):
+        self.consume()
+        self.expect(_TT_END)
+        return ContinueStmt()
+
+    # Statement keyword -> parser, looked up once per statement
+    _stmt_parsers = {
+        "let": parse_var_decl,
+        "fn": parse_func_decl,
+        "if": parse_if_stmt,
+        "while": parse_while_stmt,
+        "for": parse_for_stmt,
+        "return": parse_return_stmt,
+        "break": _parse_break,
+        "continue": _parse_continue,
+    }
+
     def parse_assign_or_expr_stmt(self):
         expr = self.parse_expression()
-        if self.match('ASSIGN'):
-            value = self.parse_expression()
-            # Unwrap literal to inner token for assignment value
-            if isinstance(value, Literal):
-                value = value.value
-            self.expect('END')
+        if self._try_consume(_TT_ASSIGN):
+            value = self._bare_literal()
+            if value is None:
+                value = self.parse_expression()
+                # Unwrap literal to inner token for assignment value
+                if isinstance(value, Literal):
+                    value = value.value
+            self.expect(_TT_END)
             if isinstance(expr, Identifier):
                 return AssignStmt(expr.name, value)
             else:
-                raise Exception("Invalid assignment target")
+                raise ParseError("Invalid assignment target", expr)
         else:
-            self.expect('END')
+            self.expect(_TT_END)
             return expr  # Expression statement
 
+    def _bare_literal(self):
+        # A literal standing alone before ';' is stored as its token; take it
+        # directly rather than building a Literal node only to unwrap it
+        i = self.current_token_index
+        if i + 1 < self._n and self.tokens[i + 1].type is _TT_END:
+            token = self.tokens[i]
+            if token.type in _LITERAL_TYPES or (token.type is _TT_KEYWORD and token.value in _LITERAL_KEYWORDS):
+                self.current_token_index = i + 1
+                return token
+        return None
+
     def parse_params(self):
         params = []
-        while self.peek().type == TokenType.IDENT:
+        while self.peek().type is _TT_IDENT:
             param_name = self.consume()
             self.expect_value(":")
-            param_type = self.expect_type(TokenType.IDENT)
+            param_type = self.expect_type(_TT_IDENT)
             params.append((param_name, param_type))
-            if not self.match('COMMA'):
+            if not self._try_consume(_TT_COMMA):
                 break
         return params
 
+    def parse_body(self):
+        # Branch/loop bodies are always a statement list, even for a single
+        # unbraced statement, so consumers never need to check the shape.
+        body = self.parse_statement()
+        if not isinstance(body, list):
+            body = [body]
+        return body
+
     def parse_block(self):
         statements = []
-        self.expect('LBRACE')
-        while not self.match('RBRACE'):
+        self.expect(_TT_LBRACE)
+        while not self._try_consume(_TT_RBRACE):
             statements.append(self.parse_statement())
         return statements
 
     # --- Expression parsing with precedence ---
     def parse_expression(self):
-        return self.parse_or()
+        return self._parse_binary(1)
 
-    def parse_or(self):
-        expr = self.parse_and()
-        while self._check_value("||"):
-            op = self.consume()
-            right = self.parse_and()
-            expr = BinaryExpr(expr, op, right)
-        return expr
-
-    def parse_and(self):
-        expr = self.parse_equality()
-        while self._check_value("&&"):
-            op = self.consume()
-            right = self.parse_equality()
-            expr = BinaryExpr(expr, op, right)
-        return expr
-
-    def parse_equality(self):
-        expr = self.parse_relational()
-        while self._check_value("==") or self._check_value("!="):
-            op = self.consume()
-            right = self.parse_relational()
-            expr = BinaryExpr(expr, op, right)
-        return expr
-
-    def parse_relational(self):
-        expr = self.parse_additive()
-        while any(
-            self._check_value(v) for v in ("<", "<=", ">", ">=")
-        ):
-            op = self.consume()
-            right = self.parse_additive()
-            expr = BinaryExpr(expr, op, right)
-        return expr
-
-    def parse_additive(self):
-        expr = self.parse_multiplicative()
-        while self._check_value("+") or self._check_value("-"):
-            op = self.consume()
-            right = self.parse_multiplicative()
-            expr = BinaryExpr(expr, op, right)
-        return expr
-
-    def parse_multiplicative(self):
+    def _parse_binary(self, min_prec):
+        # Precedence climbing: one loop covers every binary level, so an
+        # operand costs one call here instead of one call per level
         expr = self.parse_unary()
-        while any(self._check_value(v) for v in ("*", "/", "%")):
-            op = self.consume()
-            right = self.parse_unary()
+        tokens = self.tokens
+        n = self._n
+        while self.current_token_index < n:
+            op = tokens[self.current_token_index]
+            prec = _BINOP_PREC.get(op.value)
+            if prec is None or prec < min_prec:
+                break
+            self.current_token_index += 1
+            # All operators are left-associative: the right side only takes tighter ones
+            right = self._parse_binary(prec + 1)
             expr = BinaryExpr(expr, op, right)
         return expr
 
     def parse_unary(self):
-        if self._check_value("!") or self._check_value("-"):
+        i = self.current_token_index
+        if i < self._n and self.tokens[i].value in _UNARY_OPS:
             op = self.consume()
             operand = self.parse_unary()
             return UnaryExpr(op, operand)
@@ -200,77 +266,100 @@ class Parser:
 
     def parse_call(self):
         expr = self.parse_primary()
-        while self._check_type(TokenType.LPAREN):
+        while self._try_consume(_TT_LPAREN):
             # function call
-            lparen = self.consume()  # LPAREN
             args = []
-            if not self._check_type(TokenType.RPAREN):
+            if not self._check_type(_TT_RPAREN):
                 args.append(self.parse_expression())
-                while self._check_type(TokenType.COMMA):
-                    self.consume()
+                while self._try_consume(_TT_COMMA):
                     args.append(self.parse_expression())
-            self.expect('RPAREN')
+            self.expect(_TT_RPAREN)
             expr = CallExpr(expr, args)
         return expr
 
     def parse_primary(self):
         token = self.peek()
-        if token.type in (TokenType.INT, TokenType.FLOAT, TokenType.STRING):
-            return Literal(self.consume())
-        if token.type == TokenType.KEYWORD and token.value in ("true", "false", "null"):
-            return Literal(self.consume())
-        if token.type == TokenType.IDENT:
-            return Identifier(self.consume())
-        if token.type == TokenType.LPAREN:
-            self.consume()
-            expr = self.parse_expression()
-            self.expect('RPAREN')
-            return expr
-        raise Exception(f"Unexpected token in expression: {token}")
+        kind = token.type
+        # Names are the most common operand; take them before the table lookup
+        if kind is _TT_IDENT:
+            self.current_token_index += 1
+            return Identifier(token)
+        handler = self._primary_parsers.get(kind)
+        if handler is not None:
+            expr = handler(self, token)
+            if expr is not None:
+                return expr
+        raise ParseError("Unexpected token in expression: {token}", token)
+
+    def _parse_literal(self, token):
+        self.current_token_index += 1
+        return Literal(token)
+
+    def _parse_keyword_literal(self, token):
+        if token.value in _LITERAL_KEYWORDS:
+            self.current_token_index += 1
+            return Literal(token)
+        return None
+
+    def _parse_group(self, token):
+        self.current_token_index += 1
+        expr = self.parse_expression()
+        self.expect(_TT_RPAREN)
+        return expr
+
+    # Token type -> primary-expression parser; None from one means no match
+    _primary_parsers = {
+        TokenType.INT: _parse_literal,
+        TokenType.FLOAT: _parse_literal,
+        TokenType.STRING: _parse_literal,
+        _TT_KEYWORD: _parse_keyword_literal,
+        _TT_LPAREN: _parse_group,
+    }
 
     # --- Token helpers ---
     def peek(self):
-        if self.current_token_index < len(self.tokens):
+        # Running off the end is the rare case; let the index check do the bounds test
+        try:
             return self.tokens[self.current_token_index]
-        raise Exception("Unexpected end of input")
+        except IndexError:
+            raise ParseError("Unexpected end of input") from None
 
     def consume(self):
         token = self.tokens[self.current_token_index]
         self.current_token_index += 1
         return token
 
-    def match(self, expected_type):
-        if self.current_token_index < len(self.tokens):
-            token = self.tokens[self.current_token_index]
-            if token.type.name == expected_type:
-                self.current_token_index += 1
-                return True
+    def _try_consume(self, token_type):
+        # Consume the next token if it has the given type; report whether it did
+        i = self.current_token_index
+        if i < self._n and self.tokens[i].type is token_type:
+            self.current_token_index = i + 1
+            return True
         return False
 
     def _check_type(self, token_type):
-        if self.current_token_index < len(self.tokens):
-            return self.tokens[self.current_token_index].type == token_type
-        return False
-
-    def _check_value(self, value):
-        if self.current_token_index < len(self.tokens):
-            return self.tokens[self.current_token_index].value == value
+        if self.current_token_index < self._n:
+            return self.tokens[self.current_token_index].type is token_type
         return False
 
+    # The expect helpers advance the index themselves rather than calling consume
     def expect(self, expected_type):
         token = self.peek()
-        if token.type.name == expected_type:
-            return self.consume()
-        raise Exception(f"Expected token type {expected_type}, got {token.type}")
+        if token.type is expected_type:
+            self.current_token_index += 1
+            return token
+        raise ParseError("Expected token type {expected.name}, got {token.type}", token, expected_type)
 
     def expect_type(self, token_type):
         token = self.peek()
-        if token.type == token_type:
-            return self.consume()
-        raise Exception(f"Expected token type {token_type}, got {token.type}")
+        if token.type is token_type:
+            self.current_token_index += 1
+            return token
+        raise ParseError("Expected token type {expected}, got {token.type}", token, token_type)
 
     def expect_value(self, value):
         token = self.peek()
         if token.value == value:
-            return self.consume()
-        raise Exception(f"Expected token value '{value}', got '{token.value}'")
+            self.current_token_index += 1
+            return token
+        raise ParseError("Expected token value '{expected}', got '{token.value}'", token, value)
@@ -0,0 +1,212 @@
+"""
+Local-variable resolver for clite.
+
+Walks a function body once and gives every local (parameters first, then each
+`let` in order) a stable integer slot. `VarDecl`, `AssignStmt` and
+`Identifier` nodes get a `.slot` attribute; names that are not locals keep
+`slot = None` and are looked up in globals at runtime.
+
+`let` follows `Env.set`: if the name is already visible (an enclosing local,
+or one of `global_names`) the declaration assigns to that binding instead of
+shadowing it. Only a new name gets a new slot. Which globals exist is only
+known at call time, so callers re-resolve when the globals among
+`let_names(body)` change.
+
+It also does a tiny bit of type inference: a `BinaryExpr` whose operands are
+both known to be `int` (int literals, `int`-typed locals, or arithmetic on
+those) gets `numeric_kind = INT_KIND` so evaluators can take a monomorphic
+fast path. The tag only picks a code path; the operation performed is the
+same, so a mis-typed variable still behaves correctly.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Container, Dict, FrozenSet, List, Optional, Set, Tuple
+
+from lang.ast import (
+    VarDecl,
+    IfStmt,
+    WhileStmt,
+    ForStmt,
+    ReturnStmt,
+    BreakStmt,
+    ContinueStmt,
+    AssignStmt,
+    BinaryExpr,
+    UnaryExpr,
+    Literal,
+    Identifier,
+    CallExpr,
+)
+from lang.tokens import (
+    Token,
+    TokenType,
+    BINARY_OPS,
+    BINOP_ADD,
+    BINOP_SUB,
+    BINOP_MUL,
+    BINOP_MOD,
+    BINOP_AND,
+    BINOP_OR,
+    UNOP_NEG,
+)
+
+INT_KIND = "int"
+
+# Binary ops that get the int fast path when both operands are ints
+_INT_FAST_OPS = frozenset(BINARY_OPS.values()) - {BINOP_AND, BINOP_OR}
+# ...and the subset of those that also produce an int
+_INT_RESULT_OPS = frozenset({BINOP_ADD, BINOP_SUB, BINOP_MUL, BINOP_MOD})
+
+
+class Resolver:
+    def __init__(self, global_names: Container[str] = frozenset()):
+        self.global_names = global_names
+        self.scopes: List[Dict[str, int]] = []
+        self.n_locals = 0
+        self.int_slots: Set[int] = set()  # slots declared with type `int`
+        self.loop_depth = 0
+
+    def resolve_function(self, params: List[Tuple[Token, Token]], body: List[Any]) -> int:
+        # Parameters take the first slots so a call can seed the frame with its args
+        self.scopes.append({})
+        for p_name, p_type in params:
+            self.declare(p_name.value, p_type.value)
+        self.visit_block(body)
+        self.scopes.pop()
+        return self.n_locals
+
+    def declare(self, name: str, type_name: str) -> int:
+        slot = self.n_locals
+        self.n_locals += 1
+        self.scopes[-1][name] = slot
+        if type_name == INT_KIND:
+            self.int_slots.add(slot)
+        return slot
+
+    def lookup(self, name: str) -> Optional[int]:
+        for scope in reversed(self.scopes):
+            if name in scope:
+                return scope[name]
+        return None
+
+    def visit_block(self, stmts: List[Any]) -> None:
+        self.scopes.append({})
+        for s in stmts:
+            self.visit_stmt(s)
+        self.scopes.pop()
+
+    def visit_loop_body(self, stmts: List[Any]) -> None:
+        self.loop_depth += 1
+        self.visit_block(stmts)
+        self.loop_depth -= 1
+
+    def visit_stmt(self, node: Any) -> None:
+        if isinstance(node, VarDecl):
+            # init is resolved first, so `let x = x` reads whatever x already named
+            self.visit_expr(node.init_value)
+            name = node.var_name.value
+            slot = self.lookup(name)
+            if slot is None and name not in self.global_names:
+                slot = self.declare(name, node.var_type.value)
+            node.slot = slot
+            return
+        if isinstance(node, AssignStmt):
+            self.visit_expr(node.value)
+            node.slot = self.lookup(node.var_name.value)
+            return
+        if isinstance(node, IfStmt):
+            self.visit_expr(node.condition)
+            self.visit_block(node.then_branch)
+            if node.else_branch is not None:
+                self.visit_block(node.else_branch)
+            return
+        if isinstance(node, WhileStmt):
+            self.visit_expr(node.condition)
+            self.visit_loop_body(node.body)
+            return
+        if isinstance(node, ForStmt):
+            self.visit_stmt(node.init)
+            self.visit_expr(node.condition)
+            self.visit_loop_body(node.body)
+            self.visit_stmt(node.increment)
+            return
+        if isinstance(node, (BreakStmt, ContinueStmt)):
+            # Checked here so the VM and the walker reject it alike, before the call runs
+            if self.loop_depth == 0:
+                keyword = "break" if isinstance(node, BreakStmt) else "continue"
+                raise RuntimeError(f"'{keyword}' outside of a loop")
+            return
+        if isinstance(node, ReturnStmt):
+            self.visit_expr(node.value)
+            return
+        if isinstance(node, list):
+            self.visit_block(node)
+            return
+        # Expression statements; anything else has no names to resolve
+        self.visit_expr(node)
+
+    def visit_expr(self, node: Any) -> Optional[str]:
+        """Resolve names in an expression and return INT_KIND if it is known to be an int."""
+        if isinstance(node, Identifier):
+            node.slot = self.lookup(node.name.value)
+            if node.slot is not None and node.slot in self.int_slots:
+                return INT_KIND
+            return None
+        if isinstance(node, BinaryExpr):
+            left = self.visit_expr(node.left)
+            right = self.visit_expr(node.right)
+            if left is INT_KIND and right is INT_KIND and node.op_code in _INT_FAST_OPS:
+                node.numeric_kind = INT_KIND
+                if node.op_code in _INT_RESULT_OPS:
+                    return INT_KIND
+            return None
+        if isinstance(node, UnaryExpr):
+            operand = self.visit_expr(node.operand)
+            if operand is INT_KIND and node.op_code == UNOP_NEG:
+                return INT_KIND
+            return None
+        if isinstance(node, CallExpr):
+            self.visit_expr(node.callee)
+            for a in node.args:
+                self.visit_expr(a)
+            return None
+        # Literals may appear wrapped or as raw Tokens
+        tok = node.value if isinstance(node, Literal) else node
+        if isinstance(tok, Token) and tok.type == TokenType.INT:
+            return INT_KIND
+        return None
+
+
+def let_names(body: List[Any]) -> FrozenSet[str]:
+    """Every name a `let` in the body declares, at any nesting depth."""
+    names: Set[str] = set()
+    todo: List[Any] = list(body)
+    while todo:
+        node = todo.pop()
+        if isinstance(node, VarDecl):
+            names.add(node.var_name.value)
+        elif isinstance(node, IfStmt):
+            todo.extend(node.then_branch)
+            if node.else_branch is not None:
+                todo.extend(node.else_branch)
+        elif isinstance(node, WhileStmt):
+            todo.extend(node.body)
+        elif isinstance(node, ForStmt):
+            todo.append(node.init)
+            todo.extend(node.body)
+        elif isinstance(node, list):
+            todo.extend(node)
+    return frozenset(names)
+
+
+def resolve_function(
+    params: List[Tuple[Token, Token]],
+    body: List[Any],
+    global_names: Container[str] = frozenset(),
+) -> int:
+    """Annotate the body with local slots and return the number of slots needed."""
+    return Resolver(global_names).resolve_function(params, body)
+
+
+__all__ = ["Resolver", "resolve_function", "let_names", "INT_KIND"]
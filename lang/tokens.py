@@ -4,9 +4,10 @@ Lexer lives in a separate module; this file only defines token types,
 the Token dataclass, and language keyword/operator sets.
 """
 
-from dataclasses import dataclass
+import sys
+from dataclasses import dataclass, field
 from enum import Enum, auto
-from typing import Set, List
+from typing import Any, Dict, FrozenSet, List
 
 class TokenType(Enum):
     # structural
@@ -34,18 +35,26 @@ class TokenType(Enum):
     ASSIGN = auto()
     END = auto()  # statement terminator    
 
-@dataclass(frozen=True)
+# Marks a Token whose literal value has not been parsed yet
+NOT_CACHED: Any = object()
+
+@dataclass(frozen=True, slots=True)
 class Token:
     type: TokenType
     value: str
     line: int = 0
     column: int = 0
+    # Parsed literal value, filled in on first evaluation (see lang.compiler.literal_value)
+    cached: Any = field(default=NOT_CACHED, compare=False, repr=False)
 
     def __str__(self):
         return f"Token(type={self.type}, value='{self.value}', line={self.line}, column={self.column})"
 
-# Basic keywords of the language (extend as needed)
-KEYWORDS: Set[str] = {
+# Basic keywords of the language (extend as needed); frozen so membership
+# checks in the lexer are a single hash probe. Interned like every lexeme the
+# lexer emits for a name, which keeps those lookups cheap; consumers still
+# compare values with ==, since tokens may come from elsewhere.
+KEYWORDS: FrozenSet[str] = frozenset(map(sys.intern, {
     # control flow
     "if", "else", "while", "for", "return", "break", "continue",
     # declarations / functions
@@ -54,9 +63,15 @@ KEYWORDS: Set[str] = {
     "struct", "typedef", "var", "const", "func",
     # literals
     "true", "false", "null",
-}
+}))
+
+# Name lexeme -> token type for the keywords; the lexer classifies a name with
+# one lookup, `KEYWORD_TOKENS.get(name, TokenType.IDENT)`
+KEYWORD_TOKENS: Dict[str, TokenType] = dict.fromkeys(KEYWORDS, TokenType.KEYWORD)
 
-# Operators and punctuation (kept here for reference / reuse by the lexer)
+# Operators and punctuation (kept here for reference / reuse by the lexer).
+# A list, not a set: the lexer builds its alternation from it and only needs
+# it once, at import time.
 OPERATORS: List[str] = [
     "==", "!=", "<=", ">=", "&&", "||", "++", "--",
     "+=", "-=", "*=", "/=", "%=", "->", "<<", ">>",
@@ -64,4 +79,29 @@ OPERATORS: List[str] = [
     "(", ")", "{", "}", "[", "]", ";", ",", ".", ":", "?"
 ]
 
-__all__ = ["TokenType", "Token", "KEYWORDS", "OPERATORS"]
+# Integer codes for binary/unary operators, assigned to AST nodes at parse time
+# so evaluators can dispatch on an int instead of comparing operator strings.
+(
+    BINOP_ADD, BINOP_SUB, BINOP_MUL, BINOP_DIV, BINOP_MOD,
+    BINOP_LT, BINOP_LE, BINOP_GT, BINOP_GE, BINOP_EQ, BINOP_NE,
+    BINOP_AND, BINOP_OR,
+) = range(13)
+
+BINARY_OPS: Dict[str, int] = {
+    "+": BINOP_ADD, "-": BINOP_SUB, "*": BINOP_MUL, "/": BINOP_DIV, "%": BINOP_MOD,
+    "<": BINOP_LT, "<=": BINOP_LE, ">": BINOP_GT, ">=": BINOP_GE,
+    "==": BINOP_EQ, "!=": BINOP_NE,
+    "&&": BINOP_AND, "||": BINOP_OR,
+}
+
+UNOP_NEG, UNOP_NOT = range(2)
+
+UNARY_OPS: Dict[str, int] = {"-": UNOP_NEG, "!": UNOP_NOT}
+
+__all__ = [
+    "TokenType", "Token", "NOT_CACHED", "KEYWORDS", "KEYWORD_TOKENS", "OPERATORS",
+    "BINARY_OPS", "UNARY_OPS",
+    "BINOP_ADD", "BINOP_SUB", "BINOP_MUL", "BINOP_DIV", "BINOP_MOD",
+    "BINOP_LT", "BINOP_LE", "BINOP_GT", "BINOP_GE", "BINOP_EQ", "BINOP_NE",
+    "BINOP_AND", "BINOP_OR", "UNOP_NEG", "UNOP_NOT",
+]
@@ -0,0 +1,126 @@
+import unittest
+
+from lang.lexer import tokenize
+from lang.parser import Parser
+from lang.interpreter import Interpreter
+from lang.compiler import (
+    compile_function,
+    OP_LOAD_LOCAL,
+    OP_STORE_LOCAL,
+    OP_LOAD_GLOBAL,
+    OP_RETURN,
+    OP_INC_LOCAL,
+    OP_ADD_LOCAL_CONST,
+    OP_LT_LOCAL_CONST,
+)
+
+
+def compile_code(code):
+    func = Parser(tokenize(code)).parse().statements[0]
+    return compile_function(func.func_name.value, func.params, func.body)
+
+
+def run_both(code):
+    # Run on the VM and on the AST walker so the two backends stay in agreement
+    vm = Interpreter().run_code(code, entrypoint='main')
+    ast = Interpreter(bytecode=False).run_code(code, entrypoint='main')
+    return vm, ast
+
+
+class TestCompiler(unittest.TestCase):
+    def test_params_and_locals_get_slots(self):
+        co = compile_code('fn f(a: int, b: int): int { let c: int = a + b; return c; }')
+        self.assertEqual(co.n_params, 2)
+        self.assertEqual(co.n_locals, 3)
+        self.assertIn((OP_LOAD_LOCAL, 0), co.code)
+        self.assertIn((OP_STORE_LOCAL, 2), co.code)
+        self.assertEqual(co.code[-1], (OP_RETURN,))
+
+    def test_unknown_names_are_globals(self):
+        co = compile_code('fn f(): void { print(1); }')
+        self.assertIn((OP_LOAD_GLOBAL, co.names.index('print')), co.code)
+
+    def test_superinstructions(self):
+        fn = 'fn f(n: int): int { let i: int = 0; while (i < 10) { i = i + 2; n = i + 1; } return n; }'
+        co = compile_code(fn)
+        ops = [instr[0] for instr in co.code]
+        self.assertIn((OP_INC_LOCAL, 1, 2), co.code)
+        self.assertIn(OP_LT_LOCAL_CONST, ops)
+        self.assertIn(OP_ADD_LOCAL_CONST, ops)
+        self.assertEqual(run_both(fn + ' fn main(): int { return f(0); }'), (11, 11))
+
+    def test_while_with_break_and_continue(self):
+        code = (
+            'fn main(): int { let i: int = 0; let s: int = 0; '
+            'while (true) { i = i + 1; if (i > 5) { break; } if (i % 2 == 0) { continue; } s = s + i; } '
+            'return s; }'
+        )
+        self.assertEqual(run_both(code), (9, 9))
+
+    def test_for_loop_break_skips_increment(self):
+        code = (
+            'fn main(): int { let i: int = 0; let s: int = 0; '
+            'for (i = 0; i < 10; i = i + 1;) { if (i == 4) { break; } if (i == 1) { continue; } s = s + i; } '
+            'return s * 100 + i; }'
+        )
+        self.assertEqual(run_both(code), (504, 504))
+
+    def test_short_circuit(self):
+        code = 'fn boom(): bool { return 1 / 0; } fn main(): bool { return false && boom() || true; }'
+        self.assertEqual(run_both(code), (True, True))
+
+    def test_block_assigns_outer_local(self):
+        code = 'fn main(): int { let x: int = 1; { let y: int = x + 1; x = y * 10; } return x; }'
+        self.assertEqual(run_both(code), (20, 20))
+
+    def test_let_of_visible_local_assigns_it(self):
+        # `let` over a name already in scope updates it rather than shadowing
+        nested = 'fn main(): int { let x: int = 1; { let x: int = 2; } return x; }'
+        self.assertEqual(run_both(nested), (2, 2))
+        branch = 'fn main(): int { let x: int = 1; if (true) { let x: int = 3; } return x; }'
+        self.assertEqual(run_both(branch), (3, 3))
+        param = 'fn f(n: int): int { { let n: int = n + 1; } return n; } fn main(): int { return f(4); }'
+        self.assertEqual(run_both(param), (5, 5))
+
+    def test_let_of_global_assigns_it(self):
+        code = 'let g: int = 1; fn main(): int { let g: int = 5; return g; }'
+        for interp in (Interpreter(), Interpreter(bytecode=False)):
+            interp.run_code(code, entrypoint='main')
+            self.assertEqual(interp.globals.get('g'), 5)
+
+    def test_let_of_global_declared_after_first_call(self):
+        code = 'fn f(): int { let n: int = 1; return n; } let a: int = f(); let n: int = 5; let b: int = f();'
+        for interp in (Interpreter(), Interpreter(bytecode=False)):
+            interp.run_code(code)
+            self.assertEqual(interp.globals.get('n'), 1)
+            self.assertEqual((interp.globals.get('a'), interp.globals.get('b')), (1, 1))
+
+    def test_top_level_and_function_scope_alike(self):
+        body = 'let x: int = 1; { let x: int = 2; } if (true) { let x: int = x + 1; } let y: int = x;'
+        top = Interpreter()
+        top.run_code(body)
+        self.assertEqual(top.globals.get('y'), 3)
+        self.assertEqual(run_both('fn main(): int { ' + body + ' return y; }'), (3, 3))
+
+    def test_stray_break_rejected_on_both_backends(self):
+        for stmt in ('break', 'continue'):
+            code = 'fn main(): int { if (false) { ' + stmt + '; } return 1; }'
+            with self.assertRaises(RuntimeError) as ctx:
+                run_both(code)
+            self.assertEqual(str(ctx.exception), f"'{stmt}' outside of a loop")
+            with self.assertRaises(RuntimeError) as ctx:
+                Interpreter(bytecode=False).run_code(code, entrypoint='main')
+            self.assertEqual(str(ctx.exception), f"'{stmt}' outside of a loop")
+
+    def test_recursion(self):
+        code = 'fn fib(n: int): int { if (n < 2) { return n; } return fib(n - 1) + fib(n - 2); } fn main(): int { return fib(10); }'
+        self.assertEqual(run_both(code), (55, 55))
+
+    def test_out_of_scope_is_runtime_error(self):
+        code = 'fn main(): int { { let x: int = 1; } return x; }'
+        with self.assertRaises(NameError):
+            Interpreter().run_code(code, entrypoint='main')
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,6 @@
 import unittest
 
-from lang.interpreter import run
+from lang.interpreter import Interpreter, run
 
 
 class TestInterpreter(unittest.TestCase):
@@ -24,6 +24,26 @@ class TestInterpreter(unittest.TestCase):
         code = 'fn main(): int { let x: int = 1; x = -x; if (!false) { return x + 41; } return 0; }'
         self.assertEqual(run(code, entrypoint='main'), 40)
 
+    def test_string_literals(self):
+        self.assertEqual(run('fn main(): string { return "café"; }', entrypoint='main'), 'café')
+        self.assertEqual(run('fn main(): string { return "a\\tb"; }', entrypoint='main'), 'a\tb')
+
+    def test_deep_binary_chain(self):
+        # Deep enough to exercise the walker's explicit-stack evaluation
+        expr = " + ".join(str(i) for i in range(1, 41)) + " - 7 % 4 * 2"
+        walker = Interpreter(bytecode=False)
+        self.assertEqual(walker.run_code(f'fn main(): int {{ return {expr}; }}', entrypoint='main'), eval(expr))
+        code = f'fn main(): bool {{ return {expr} > 1 || 1 / 0; }}'
+        self.assertEqual(walker.run_code(code, entrypoint='main'), True)
+
+    def test_run_code_reuses_parsed_program(self):
+        interp = Interpreter()
+        code = 'let n: int = 0; fn main(): int { n = n + 1; return n; }'
+        self.assertEqual(interp.run_code(code, entrypoint='main'), 1)
+        program = interp._program_cache[code]
+        self.assertEqual(interp.run_code(code, entrypoint='main'), 1)
+        self.assertIs(interp._program_cache[code], program)
+
 
 if __name__ == "__main__":
     unittest.main()
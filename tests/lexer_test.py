@@ -69,10 +69,37 @@ class TestParserTokenize(unittest.TestCase):
         ]
         self.assertEqual(lexer.tokenize(code), expected)
 
+    def test_comments_are_skipped(self):
+        code = "a /* one\ntwo */ b // trailing /* not a block\nc"
+        expected = [
+            Token(type=TokenType.IDENT, value='a', line=1, column=1),
+            Token(type=TokenType.IDENT, value='b', line=2, column=8),
+            Token(type=TokenType.IDENT, value='c', line=3, column=1)
+        ]
+        self.assertEqual(lexer.tokenize(code), expected)
+
+    def test_comment_markers_inside_string(self):
+        tokens = lexer.tokenize('s = "/* // */";')
+        self.assertEqual(tokens[2], Token(type=TokenType.STRING, value='"/* // */"', line=1, column=5))
+
     def test_unexpected_character(self):
         code = "x = 5$;"
         with self.assertRaises(SyntaxError):
             lexer.tokenize(code)
 
+    def test_scanner_matches_regex_lexer(self):
+        code = (
+            'fn f(a: int): float { let s: string = "q\\"/* x */"; /* multi\nline */\n'
+            '  while (a <= 10 && a != 3) { a = a + 1; } // tail /*\n'
+            '  return 2.5 * -a % 7 >= 1 || !b; } / 1. /* open'
+        )
+        self.assertEqual(lexer.tokenize(code), lexer.tokenize_regex(code))
+        for bad in ('x = 5$;', '"unterminated'):
+            with self.assertRaises(SyntaxError):
+                lexer.tokenize_regex(bad)
+            with self.assertRaises(SyntaxError):
+                lexer.tokenize(bad)
+
+
 if __name__ == "__main__":
     unittest.main()
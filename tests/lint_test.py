@@ -0,0 +1,86 @@
+import unittest
+
+from lang import lint
+from lang.lexer import tokenize
+from lang.tokens import Token
+
+
+def codes(code):
+    return [(w.code, w.line, w.column) for w in lint.lint_code(code)]
+
+
+class TestLint(unittest.TestCase):
+    def test_clean_program(self):
+        code = 'fn main(): int { let x: int = 1; while (x) { x = x - 1; } return x; }'
+        self.assertEqual(codes(code), [])
+
+    def test_empty_and_comment_only(self):
+        self.assertEqual(codes(''), [])
+        self.assertEqual(codes('// nothing\n/* here */'), [])
+
+    def test_missing_semicolon(self):
+        self.assertEqual(codes('fn main(): void { print(1) let x: int = 2; }'), [('W001', 1, 19)])
+
+    def test_missing_colon_and_paren(self):
+        code = 'fn main(): void { let x = 1; if x { print(x); } }'
+        self.assertEqual(codes(code), [('W003', 1, 23), ('W005', 1, 30)])
+
+    def test_unbalanced_delimiters(self):
+        self.assertEqual(codes('fn main(): void { print(1]; '), [
+            ('W001', 1, 19), ('W004', 1, 26), ('W004', 1, 17), ('W004', 1, 24),
+        ])
+
+    def test_undefined_variables(self):
+        code = '{ let x: int = 1; } x = 2; print(y);'
+        self.assertEqual(codes(code), [('W002', 1, 21), ('W002', 1, 34)])
+
+    def test_unbraced_body_is_its_own_scope(self):
+        # Same as the braced form: q is gone once the if body ends
+        self.assertEqual(codes('if (true) let q: int = 1; print(q);'), [('W002', 1, 33)])
+        self.assertEqual(codes('if (true) { let q: int = 1; } print(q);'), [('W002', 1, 37)])
+
+    def test_unclosed_string_falls_back_to_text_scan(self):
+        self.assertEqual(codes('fn main(): void {\n  print("hi);\n'), [
+            ('W006', 2, 9), ('W004', 1, 17), ('W004', 2, 8),
+        ])
+
+    def test_lint_tokens_matches_lint_code(self):
+        code = 'let x = 1 if x { print(y); }'
+        self.assertEqual(lint.lint_tokens(tokenize(code)), lint.lint_code(code))
+
+    def test_lint_tokens_accepts_hand_built_tokens(self):
+        # Editors may build tokens themselves; values need not be interned
+        code = 'let x = 1;\nif x { print(y); }\nfn f(a: int) { return a }'
+        tokens = [Token(t.type, ''.join(list(t.value)), t.line, t.column) for t in tokenize(code)]
+        self.assertIsNot(tokens[0].value, tokenize(code)[0].value)
+        self.assertEqual(lint.lint_tokens(tokens), lint.lint_code(code))
+        self.assertEqual([w.code for w in lint.lint_tokens(tokens)], ['W001', 'W003', 'W005'])
+
+    def test_repeated_calls_return_independent_lists(self):
+        code = 'let x = 1'
+        first = lint.lint_code(code)
+        first.clear()
+        self.assertEqual(lint.lint_code(code), lint._lint_code_uncached(code))
+        self.assertEqual(len(lint.lint_code(code)), 2)
+
+    def test_result_cache_is_bounded(self):
+        for i in range(lint._LINT_CACHE_SIZE + 10):
+            lint.lint_code(f'let x{i}: int = {i};')
+        self.assertEqual(len(lint._lint_cache), lint._LINT_CACHE_SIZE)
+        self.assertEqual(lint.lint_code('let x0: int = 0;'), [])
+
+    def test_single_check_helpers_match_fused_scan(self):
+        tokens = tokenize('let a = 1 if x { ( } let b: int = 2')
+        out = []
+        lint._scan_all(tokens, out)
+        self.assertEqual(
+            out,
+            lint._lint_missing_semicolons(tokens)
+            + lint._lint_missing_colon_in_let(tokens)
+            + lint._lint_unbalanced_delimiters(tokens)
+            + lint._lint_control_missing_paren(tokens),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
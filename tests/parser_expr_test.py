@@ -3,6 +3,7 @@ import unittest
 from lang.lexer import tokenize
 from lang.parser import Parser
 from lang.ast import AssignStmt, BinaryExpr, UnaryExpr, Identifier, Literal, CallExpr
+from lang.tokens import BINOP_ADD, BINOP_MUL, BINOP_AND, UNOP_NEG
 
 
 class TestParserExpressions(unittest.TestCase):
@@ -54,6 +55,25 @@ class TestParserExpressions(unittest.TestCase):
         self.assertIsInstance(top.right, BinaryExpr)
         self.assertEqual(top.right.operator.value, '<')
 
+    def test_binary_operators_are_left_associative(self):
+        ast = self.parse_code("x = 8 - 4 - 2 || a || b;")
+        top = ast.statements[0].value
+        # x = ((8 - 4) - 2 || a) || b
+        self.assertEqual(top.operator.value, '||')
+        self.assertEqual(top.left.operator.value, '||')
+        sub = top.left.left
+        self.assertEqual(sub.operator.value, '-')
+        self.assertEqual(sub.left.operator.value, '-')
+        self.assertEqual(sub.right.value.value, '2')
+
+    def test_operator_codes(self):
+        ast = self.parse_code("x = -1 + 2 * 3 && y;")
+        top = ast.statements[0].value
+        self.assertEqual(top.op_code, BINOP_AND)
+        self.assertEqual(top.left.op_code, BINOP_ADD)
+        self.assertEqual(top.left.left.op_code, UNOP_NEG)
+        self.assertEqual(top.left.right.op_code, BINOP_MUL)
+
     def test_call_expression(self):
         ast = self.parse_code("x = add(40, 2);")
         stmt = ast.statements[0]
@@ -1,6 +1,6 @@
 import unittest
 from lang.lexer import tokenize
-from lang.parser import Parser
+from lang.parser import Parser, ParseError
 from lang.ast import Program, VarDecl, AssignStmt, Identifier, Literal, FuncDecl, IfStmt, WhileStmt, ReturnStmt
 
 class TestParser(unittest.TestCase):
@@ -40,6 +40,14 @@ class TestParser(unittest.TestCase):
         self.assertIsInstance(ast.statements[0].then_branch, list)
         self.assertIsInstance(ast.statements[0].else_branch, list)
 
+    def test_unbraced_bodies_become_lists(self):
+        code = "if (x) x = 1; else while (x) x = 0;"
+        stmt = self.parse_code(code).statements[0]
+        self.assertIsInstance(stmt.then_branch, list)
+        self.assertIsInstance(stmt.then_branch[0], AssignStmt)
+        self.assertIsInstance(stmt.else_branch[0], WhileStmt)
+        self.assertIsInstance(stmt.else_branch[0].body, list)
+
     def test_while_stmt(self):
         code = "while (x) { x = x; }"
         ast = self.parse_code(code)
@@ -52,5 +60,19 @@ class TestParser(unittest.TestCase):
         self.assertIsInstance(ast.statements[0], ReturnStmt)
         self.assertEqual(ast.statements[0].value.value, "42")
 
+    def test_parse_error_keeps_token(self):
+        with self.assertRaises(ParseError) as ctx:
+            self.parse_code("let x int = 1;")
+        self.assertEqual(ctx.exception.token.value, "int")
+        self.assertEqual(str(ctx.exception), "Expected token value ':', got 'int'")
+
+    def test_memoized_reparse_reuses_result(self):
+        parser = Parser(tokenize("f(1) + 2;"), memoize=True)
+        first = parser.parse_call()
+        end = parser.current_token_index
+        parser.current_token_index = 0
+        self.assertIs(parser.parse_call(), first)
+        self.assertEqual(parser.current_token_index, end)
+
 if __name__ == "__main__":
     unittest.main()
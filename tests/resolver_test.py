@@ -0,0 +1,60 @@
+import unittest
+
+from lang.lexer import tokenize
+from lang.parser import Parser
+from lang.resolver import resolve_function, INT_KIND
+
+
+def resolve_code(code):
+    func = Parser(tokenize(code)).parse().statements[0]
+    n_locals = resolve_function(func.params, func.body)
+    return func, n_locals
+
+
+class TestResolver(unittest.TestCase):
+    def test_params_then_locals(self):
+        func, n_locals = resolve_code('fn f(a: int, b: int): int { let c: int = a; return c + b; }')
+        self.assertEqual(n_locals, 3)
+        decl, ret = func.body
+        self.assertEqual(decl.slot, 2)
+        self.assertEqual(decl.init_value.slot, 0)
+        self.assertEqual(ret.value.left.slot, 2)
+        self.assertEqual(ret.value.right.slot, 1)
+
+    def test_let_in_nested_block_reuses_visible_slot(self):
+        func, n_locals = resolve_code(
+            'fn f(): int { let x: int = 1; { let x: int = x + 1; let y: int = x; } { let y: int = 0; } return x; }'
+        )
+        self.assertEqual(n_locals, 3)
+        outer, first, second, ret = func.body
+        inner, y1 = first
+        self.assertEqual(inner.init_value.left.slot, outer.slot)
+        self.assertEqual(inner.slot, outer.slot)
+        self.assertEqual(ret.value.slot, outer.slot)
+        # A name that is not visible yet still gets a fresh slot per block
+        self.assertNotEqual(y1.slot, second[0].slot)
+
+    def test_let_of_global_name_has_no_slot(self):
+        func = Parser(tokenize('fn f(): int { let g: int = 5; return g; }')).parse().statements[0]
+        self.assertEqual(resolve_function(func.params, func.body, {'g'}), 0)
+        decl, ret = func.body
+        self.assertIsNone(decl.slot)
+        self.assertIsNone(ret.value.slot)
+
+    def test_globals_have_no_slot(self):
+        func, _ = resolve_code('fn f(): void { g = print; }')
+        assign = func.body[0]
+        self.assertIsNone(assign.slot)
+        self.assertIsNone(assign.value.slot)
+
+    def test_int_kind_tagging(self):
+        func, _ = resolve_code('fn f(a: int, s: string): bool { return a * 2 + 1 < a && s == s; }')
+        top = func.body[0].value
+        self.assertIsNone(top.numeric_kind)  # && never takes the int path
+        self.assertEqual(top.left.numeric_kind, INT_KIND)
+        self.assertEqual(top.left.left.numeric_kind, INT_KIND)
+        self.assertIsNone(top.right.numeric_kind)
+
+
+if __name__ == "__main__":
+    unittest.main()